@@ -7,8 +7,9 @@
 # flake8: noqa: D102,D103
 
 import asyncio
-from collections.abc import AsyncIterable
+from collections.abc import AsyncIterable, Generator
 from pathlib import Path
+from typing import Any
 
 import pytest
 from wid import (
@@ -16,6 +17,7 @@ from wid import (
     async_hlc_wid_stream,
     async_next_hlc_wid,
     async_next_wid,
+    async_next_wid_batch,
     async_wid_stream,
     parse_wid,
     validate_hlc_wid,
@@ -24,6 +26,17 @@ from wid import (
 from wid.wid import WidGenState
 
 
+# One event loop for the whole module: asyncio.run builds and tears down a
+# fresh loop (selector + default executor) per call.
+@pytest.fixture(name="loop", scope="module")
+def loop_fixture() -> Generator[asyncio.AbstractEventLoop, Any, None]:
+    loop = asyncio.new_event_loop()
+    try:
+        yield loop
+    finally:
+        loop.close()
+
+
 async def _collect_async(gen: AsyncIterable[str], n: int) -> list[str]:
     out: list[str] = []
     async for item in gen:
@@ -33,31 +46,41 @@ async def _collect_async(gen: AsyncIterable[str], n: int) -> list[str]:
     return out
 
 
-def test_async_next_wid() -> None:
-    wid = asyncio.run(async_next_wid(W=4, Z=6))
+def test_async_next_wid(loop: asyncio.AbstractEventLoop) -> None:
+    wid = loop.run_until_complete(async_next_wid(W=4, Z=6))
     assert validate_wid(wid, W=4, Z=6)
 
 
-def test_async_next_hlc_wid() -> None:
-    wid = asyncio.run(async_next_hlc_wid(node="node01", W=4, Z=0))
+def test_async_next_wid_batch(loop: asyncio.AbstractEventLoop) -> None:
+    values = loop.run_until_complete(async_next_wid_batch(5, W=4, Z=0))
+    assert len(values) == 5
+    assert all(validate_wid(v, W=4, Z=0) for v in values)
+    assert values == sorted(values)
+    assert len(set(values)) == 5
+
+
+def test_async_next_hlc_wid(loop: asyncio.AbstractEventLoop) -> None:
+    wid = loop.run_until_complete(async_next_hlc_wid(node="node01", W=4, Z=0))
     assert validate_hlc_wid(wid, W=4, Z=0)
 
 
-def test_async_wid_stream_count_and_order() -> None:
-    values = asyncio.run(_collect_async(async_wid_stream(count=3, W=4, Z=0), 3))
+def test_async_wid_stream_count_and_order(loop: asyncio.AbstractEventLoop) -> None:
+    values = loop.run_until_complete(
+        _collect_async(async_wid_stream(count=3, W=4, Z=0), 3)
+    )
     assert len(values) == 3
     assert values[0] < values[1] < values[2]
 
 
-def test_async_hlc_stream_count_and_order() -> None:
-    values = asyncio.run(
+def test_async_hlc_stream_count_and_order(loop: asyncio.AbstractEventLoop) -> None:
+    values = loop.run_until_complete(
         _collect_async(async_hlc_wid_stream(node="node01", count=3, W=4, Z=0), 3)
     )
     assert len(values) == 3
     assert values[0] < values[1] < values[2]
 
 
-def test_async_stream_rejects_invalid_args() -> None:
+def test_async_stream_rejects_invalid_args(loop: asyncio.AbstractEventLoop) -> None:
     async def _run() -> None:
         with pytest.raises(ValueError):
             async for _ in async_wid_stream(count=-1):
@@ -72,16 +95,26 @@ def test_async_stream_rejects_invalid_args() -> None:
             async for _ in async_hlc_wid_stream(count=1, interval_ms=-1):
                 pass
 
-    asyncio.run(_run())
+    loop.run_until_complete(_run())
 
 
-def test_async_next_wid_supports_sqlite_store(tmp_path: Path) -> None:
+def test_async_next_wid_supports_sqlite_store(
+    loop: asyncio.AbstractEventLoop, tmp_path: Path
+) -> None:
     aiosqlite = pytest.importorskip("aiosqlite")
     _ = aiosqlite
     db_path = str(tmp_path / "wid_async_state.sqlite")
 
-    first = asyncio.run(async_next_wid(W=4, Z=0, database_path=db_path))
-    second = asyncio.run(async_next_wid(W=4, Z=0, database_path=db_path))
+    # One store instance for both allocations, instead of async_next_wid
+    # constructing (and opening/closing) a fresh store per call.
+    async def _allocate_two() -> tuple[str, str]:
+        async with AsyncSqliteWidStateStore(db_path) as store:
+            return (
+                await store.next_wid(w=4, z=0),
+                await store.next_wid(w=4, z=0),
+            )
+
+    first, second = loop.run_until_complete(_allocate_two())
 
     first_parsed = parse_wid(first, W=4, Z=0)
     second_parsed = parse_wid(second, W=4, Z=0)
@@ -93,17 +126,18 @@ def test_async_next_wid_supports_sqlite_store(tmp_path: Path) -> None:
     )
 
 
-def test_async_sqlite_store_roundtrip(tmp_path: Path) -> None:
+def test_async_sqlite_store_roundtrip(
+    loop: asyncio.AbstractEventLoop, tmp_path: Path
+) -> None:
     aiosqlite = pytest.importorskip("aiosqlite")
     _ = aiosqlite
     db_path = str(tmp_path / "wid_async_store.sqlite")
-    store = AsyncSqliteWidStateStore(db_path, "wid-test")
-
     async def _run() -> None:
-        await store.save("state-1", state=WidGenState(last_sec=10, last_seq=4))
-        loaded = await store.load("state-1")
-        assert loaded is not None
-        assert loaded.last_sec == 10
-        assert loaded.last_seq == 4
-
-    asyncio.run(_run())
+        async with AsyncSqliteWidStateStore(db_path, "wid-test") as store:
+            await store.save("state-1", state=WidGenState(last_sec=10, last_seq=4))
+            loaded = await store.load("state-1")
+            assert loaded is not None
+            assert loaded.last_sec == 10
+            assert loaded.last_seq == 4
+
+    loop.run_until_complete(_run())
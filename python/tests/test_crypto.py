@@ -7,9 +7,10 @@
 # pyright: reportPrivateUsage=false
 # flake8: noqa: D102,D103,C901
 
+import base64
+import contextlib
+import io
 import json
-import os
-import subprocess
 import sys
 import tempfile
 from collections.abc import Generator
@@ -19,12 +20,27 @@ from typing import Any
 import pytest
 from cryptography.hazmat.primitives import serialization
 from cryptography.hazmat.primitives.asymmetric import ed25519
+from wid import cli as wid_cli
+
+from .conftest import REPO_ROOT
 
-# Define the root directory of the project
-REPO_ROOT = Path(__file__).parent.parent.parent.resolve()
 CLI_PATH = REPO_ROOT / "python" / "wid" / "cli.py"
 CONFORMANCE_CRYPTO_PATH = REPO_ROOT / "spec" / "conformance" / "crypto.json"
 
+try:
+    from orjson import loads as _json_loads  # noqa: I001
+except ImportError:  # pragma: no cover
+    _json_loads = json.loads
+
+# Parsed once at import; parametrize re-evaluates its argument on every
+# collection pass, so keep the loaded list module-level. Non-Ed25519 cases
+# are filtered here so they never reach fixture setup.
+_CONFORMANCE_TESTS: list[dict[str, Any]] = [
+    tc
+    for tc in _json_loads(CONFORMANCE_CRYPTO_PATH.read_bytes())
+    if tc.get("key_type") == "ed25519"
+]
+
 
 @pytest.fixture(name="temp_dir")
 def temp_dir_fixture() -> Generator[Path, Any, None]:
@@ -32,8 +48,9 @@ def temp_dir_fixture() -> Generator[Path, Any, None]:
         yield Path(tmpdir)
 
 
-@pytest.fixture(name="ed25519_key_pair")
-def ed25519_key_pair_fixture(temp_dir: Path) -> tuple[Path, Path]:
+def _write_ed25519_key_pair(
+    key_dir: Path, stem: str
+) -> tuple[Path, Path, ed25519.Ed25519PrivateKey]:
     private_key = ed25519.Ed25519PrivateKey.generate()
     public_key = private_key.public_key()
 
@@ -47,80 +64,92 @@ def ed25519_key_pair_fixture(temp_dir: Path) -> tuple[Path, Path]:
         format=serialization.PublicFormat.SubjectPublicKeyInfo,
     )
 
-    private_key_path = temp_dir / "private_key.pem"
-    public_key_path = temp_dir / "public_key.pem"
+    private_key_path = key_dir / f"private_key{stem}.pem"
+    public_key_path = key_dir / f"public_key{stem}.pem"
 
     private_key_path.write_bytes(private_pem)
     public_key_path.write_bytes(public_pem)
 
-    return private_key_path, public_key_path
+    return private_key_path, public_key_path, private_key
 
 
-@pytest.fixture(name="ed25519_key_pair_alt")
-def ed25519_key_pair_alt_fixture(temp_dir: Path) -> tuple[Path, Path]:
-    private_key = ed25519.Ed25519PrivateKey.generate()
-    public_key = private_key.public_key()
+# Session scope: keys are generated and PEM-encoded exactly once, not per
+# parametrized conformance case.
+@pytest.fixture(name="ed25519_key_pair", scope="session")
+def ed25519_key_pair_fixture(
+    tmp_path_factory: pytest.TempPathFactory,
+) -> tuple[Path, Path, ed25519.Ed25519PrivateKey]:
+    return _write_ed25519_key_pair(tmp_path_factory.mktemp("ed25519_keys"), "")
 
-    private_pem = private_key.private_bytes(
-        encoding=serialization.Encoding.PEM,
-        format=serialization.PrivateFormat.PKCS8,
-        encryption_algorithm=serialization.NoEncryption(),
-    )
-    public_pem = public_key.public_bytes(
-        encoding=serialization.Encoding.PEM,
-        format=serialization.PublicFormat.SubjectPublicKeyInfo,
-    )
 
-    private_key_path = temp_dir / "private_key_alt.pem"
-    public_key_path = temp_dir / "public_key_alt.pem"
+@pytest.fixture(name="ed25519_key_pair_alt", scope="session")
+def ed25519_key_pair_alt_fixture(
+    tmp_path_factory: pytest.TempPathFactory,
+) -> tuple[Path, Path, ed25519.Ed25519PrivateKey]:
+    return _write_ed25519_key_pair(tmp_path_factory.mktemp("ed25519_keys_alt"), "_alt")
+
+
+def _write_tmp(tmp: Path, name: str, content: str) -> str:
+    # bytes-level write: encode once, skip the text-wrapper layer
+    path = tmp / name
+    path.write_bytes(content.encode("utf-8"))
+    return str(path)
 
-    private_key_path.write_bytes(private_pem)
-    public_key_path.write_bytes(public_pem)
 
-    return private_key_path, public_key_path
+def _sign_like_cli(
+    private_key: ed25519.Ed25519PrivateKey, wid_str: str, data_path: str | None
+) -> str:
+    # Mirrors the CLI's canonical message: "wid-sig-v1:" + len(WID) + ":" +
+    # WID + DATA, with the signature urlsafe-base64 encoded, padding stripped.
+    wid_bytes = wid_str.encode("utf-8")
+    message = f"wid-sig-v1:{len(wid_bytes)}:".encode("ascii") + wid_bytes
+    if data_path:
+        message += Path(data_path).read_bytes()
+    return base64.urlsafe_b64encode(private_key.sign(message)).decode("ascii").rstrip("=")
 
 
 def run_wid_cli(args: list[str], expected_exit_code: int = 0) -> str:
-    cmd = [sys.executable, "-m", "wid.cli", *args]
-    env = dict(os.environ)
-    local_py = str(REPO_ROOT / "python")
-    env["PYTHONPATH"] = (
-        f"{local_py}{os.pathsep}{env['PYTHONPATH']}"
-        if env.get("PYTHONPATH")
-        else local_py
-    )
-    result = subprocess.run(cmd, capture_output=True, text=True, check=False, env=env)
-
-    if result.returncode != expected_exit_code:
-        sys.stderr.write(f"Command failed with exit code {result.returncode}\n")
-        sys.stderr.write(f"Stdout:\n{result.stdout}\n")
-        sys.stderr.write(f"Stderr:\n{result.stderr}\n")
-        msg =  f"Expected: {expected_exit_code}, Got: {result.returncode}"
-        cmd_str = " ".join(cmd)
+    # Invoke the CLI in-process: no fork/exec, no repeated interpreter startup
+    # or `wid` import per conformance case.
+    stdout = io.StringIO()
+    stderr = io.StringIO()
+    original_argv = list(sys.argv)
+    returncode = 0
+    try:
+        sys.argv = [original_argv[0], *args]
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            wid_cli.main()
+    except SystemExit as exc:
+        returncode = int(exc.code) if isinstance(exc.code, int) else 1
+    finally:
+        sys.argv = original_argv
+
+    if returncode != expected_exit_code:
+        sys.stderr.write(f"Command failed with exit code {returncode}\n")
+        sys.stderr.write(f"Stdout:\n{stdout.getvalue()}\n")
+        sys.stderr.write(f"Stderr:\n{stderr.getvalue()}\n")
+        msg = f"Expected: {expected_exit_code}, Got: {returncode}"
+        cmd_str = " ".join(["wid", *args])
         pytest.fail(
             f"CLI command failed with unexpected exit code. Command: {cmd_str}. {msg}"
         )
 
-    return result.stdout.strip()
-
-
-def load_conformance_tests() -> Any:
-    with open(CONFORMANCE_CRYPTO_PATH, "r", encoding="utf-8") as f:
-        return json.load(f)
+    return stdout.getvalue().strip()
 
 
-@pytest.mark.parametrize("test_case", load_conformance_tests())
+@pytest.mark.parametrize(
+    "test_case",
+    _CONFORMANCE_TESTS,
+    ids=[tc["description"] for tc in _CONFORMANCE_TESTS],
+)
 def test_crypto_conformance(
     test_case: dict[str, Any],
     temp_dir: Path,
-    ed25519_key_pair: tuple[Path, Path],
-    ed25519_key_pair_alt: tuple[Path, Path],
+    ed25519_key_pair: tuple[Path, Path, ed25519.Ed25519PrivateKey],
+    ed25519_key_pair_alt: tuple[Path, Path, ed25519.Ed25519PrivateKey],
 ) -> None:
-    private_key_path, public_key_path = ed25519_key_pair
-    _private_key_path_alt, public_key_path_alt = ed25519_key_pair_alt
-
-    if test_case["key_type"] != "ed25519":
-        pytest.skip(f"Skipping non-Ed25519 test case: {test_case['description']}")
+    private_key_path, public_key_path, private_key = ed25519_key_pair
+    _, public_key_path_alt, _private_key_alt = ed25519_key_pair_alt
 
     test_type = test_case["test_type"]
 
@@ -128,9 +157,7 @@ def test_crypto_conformance(
         wid_to_sign = test_case["wid"]
         data_path = None
         if "data_content" in test_case:
-            data_file_path = temp_dir / "data.txt"
-            data_file_path.write_text(test_case["data_content"])
-            data_path = str(data_file_path)
+            data_path = _write_tmp(temp_dir, "data.txt", test_case["data_content"])
 
         # Sign the WID (and optional data)
         sign_args = [
@@ -165,19 +192,13 @@ def test_crypto_conformance(
 
         data_path_for_sign = None
         if original_data_content:
-            data_file_path = temp_dir / "original_data.txt"
-            data_file_path.write_text(original_data_content)
-            data_path_for_sign = str(data_file_path)
-
-        sign_args = [
-            "A=sign",
-            f"WID={original_wid}",
-            f"KEY={private_key_path}",
-        ]
-        if data_path_for_sign:
-            sign_args.append(f"DATA={data_path_for_sign}")
+            data_path_for_sign = _write_tmp(
+                temp_dir, "original_data.txt", original_data_content
+            )
 
-        valid_signature = run_wid_cli(sign_args)
+        # Sign in-process with the fixture's key object; only the verify
+        # step needs to exercise the CLI (and is expected to fail).
+        valid_signature = _sign_like_cli(private_key, original_wid, data_path_for_sign)
 
         # Now attempt to verify with a modification
         wid_for_verify = test_case.get("modified_wid", original_wid)
@@ -191,9 +212,14 @@ def test_crypto_conformance(
 
         data_path_for_verify = None
         if data_content_for_verify:
-            data_file_path = temp_dir / "data_for_verify.txt"
-            data_file_path.write_text(data_content_for_verify)
-            data_path_for_verify = str(data_file_path)
+            if data_content_for_verify == original_data_content:
+                # identical content: reuse the signed file instead of writing
+                # a second copy
+                data_path_for_verify = data_path_for_sign
+            else:
+                data_path_for_verify = _write_tmp(
+                    temp_dir, "data_for_verify.txt", data_content_for_verify
+                )
 
         verify_args = [
             "A=verify",
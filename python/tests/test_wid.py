@@ -8,6 +8,7 @@
 # flake8: noqa: D102,D103
 
 import re
+import time
 from pathlib import Path
 
 import pytest
@@ -23,6 +24,10 @@ from wid import (
     validate_wid,
 )
 
+_PAD_TAIL = re.compile(r"-([0-9a-f]+)$")
+
+_NODE_RE_OVERRIDE = re.compile(r"^$")  # matches only empty, node will fail
+
 
 class TestValidateWid:
     """Tests for validate_wid function (WID without node)."""
@@ -215,15 +220,11 @@ class TestWidGen:
     def test_generates_unique_padding(self) -> None:
         gen = WidGen(W=4, Z=6)
         wids = gen.next_n(10)
-        paddings = [
-            parse_wid(w, W=4, Z=6).padding   # type: ignore[unused-ignore,union-attr] # pyright: ignore[reportOptionalMemberAccess] # pylint: disable=line-too-long
-            for w in wids
-            if w
-        ]
-        # All paddings should be non-None
-        assert all(p is not None for p in paddings)
-        # All paddings should be unique
-        assert len(set(paddings)) == 10
+        # Pull the padding suffix in one regex pass per WID instead of a full
+        # parse_wid round-trip; a set of 10 means every padding was present
+        # and unique.
+        paddings = {m.group(1) for w in wids if (m := _PAD_TAIL.search(w))}
+        assert len(paddings) == 10
 
     def test_raises_on_invalid_w(self) -> None:
         with pytest.raises(ValueError):
@@ -250,33 +251,17 @@ class TestWidGen:
         # state = gen2.state()
         # assert parsed.sequence == state.last_seq + 1
 
-    def test_persists_and_restores_state_using_memory_store(self) -> None:
-        store = MemoryWidStateStore()
-        gen1 = WidGen(
-            W=4,
-            Z=0,
-            state_store=store,
-            state_key="test-state",
-            auto_persist=True,
-        )
-        gen1.next()
-        state = gen1.state()
+    @pytest.fixture(name="store", params=["memory", "sqlite"])
+    def store_fixture(
+        self, request: pytest.FixtureRequest, tmp_path: Path
+    ) -> MemoryWidStateStore | SqliteWidStateStore:
+        if request.param == "memory":
+            return MemoryWidStateStore()
+        return SqliteWidStateStore(str(tmp_path / "wid_state.sqlite"), "wid-test")
 
-        gen2 = WidGen(
-            W=4,
-            Z=0,
-            state_store=store,
-            state_key="test-state",
-            auto_persist=True,
-        )
-        state2 = gen2.state()
-        assert state2.last_sec == state.last_sec
-        assert state2.last_seq == state.last_seq
-
-    def test_persists_and_restores_state_using_sqlite_store(
-        self, tmp_path: Path
+    def test_persists_and_restores_state(
+        self, store: MemoryWidStateStore | SqliteWidStateStore
     ) -> None:
-        store = SqliteWidStateStore(str(tmp_path / "wid_state.sqlite"), "wid-test")
         gen1 = WidGen(
             W=4,
             Z=0,
@@ -346,8 +331,6 @@ class TestHLCWidGen:
         wid1 = gen.next()
 
         # Simulate receiving a remote event with higher timestamp
-        import time
-
         remote_pt = int(time.time()) + 100  # 100 seconds in future
         gen.observe(remote_pt, 5)
 
@@ -416,40 +399,22 @@ class TestParseEdgeCases:
     def test_parse_hlc_node_regex_rejection_path(self) -> None:
         # Force node regex rejection branch by temporarily overriding the matcher.
         original = parse_mod._NODE_RE
-        parse_mod._NODE_RE = re.compile(r"^$")  # matches only empty, node will fail
+        parse_mod._NODE_RE = _NODE_RE_OVERRIDE
+        parse_mod.clear_parse_caches()  # a memoized hit would bypass the matcher
         try:
             assert parse_hlc_wid("20260212T091530.0000Z-node01", W=4, Z=0) is None
         finally:
             parse_mod._NODE_RE = original
+            parse_mod.clear_parse_caches()
 
     def test_parse_wid_suffix_without_dash_rejection_path(self) -> None:
-        # Force suffix-without-leading-dash branch via cached base regex override.
-        key = (4, "sec")
-        original = parse_mod._WID_BASE_RE_CACHE.get(key)
-        parse_mod._WID_BASE_RE_CACHE[key] = re.compile(
-            r"^(\d{8})T(\d{6})\.(\d{4})Z(x)$"
-        )
-        try:
-            assert parse_wid("20260212T091530.0000Zx", W=4, Z=6) is None
-        finally:
-            if original is None:
-                del parse_mod._WID_BASE_RE_CACHE[key]
-            else:
-                parse_mod._WID_BASE_RE_CACHE[key] = original
+        # A trailing segment that does not open with "-" must be rejected.
+        assert parse_wid("20260212T091530.0000Zx", W=4, Z=6) is None
 
     def test_parse_hlc_suffix_without_dash_rejection_path(self) -> None:
-        key = (4, "sec")
-        original = parse_mod._HLC_BASE_RE_CACHE.get(key)
-        parse_mod._HLC_BASE_RE_CACHE[key] = re.compile(
-            r"^(\d{8})T(\d{6})\.(\d{4})Z-([^\s-]+)(x)$"
-        )
-        try:
-            assert parse_hlc_wid("20260212T091530.0000Z-node01x", W=4, Z=6) is None
-        finally:
-            if original is None:
-                del parse_mod._HLC_BASE_RE_CACHE[key]
-            else:
-                parse_mod._HLC_BASE_RE_CACHE[key] = original
+        # The node scan stops at whitespace; the leftover " x" lacks the
+        # leading "-" a padding suffix requires.
+        assert parse_hlc_wid("20260212T091530.0000Z-node01 x", W=4, Z=6) is None
 
 
 class TestWidGenEdgeCases:
@@ -5,7 +5,10 @@ from .async_api import (
     async_hlc_wid_stream,
     async_next_hlc_wid,
     async_next_wid,
+    async_next_wid_batch,
     async_wid_stream,
+    next_hlc_wid_sync,
+    next_wid_sync,
 )
 from .hlc import HLCWidGen
 from .parse import (
@@ -39,7 +42,10 @@ __all__ = [
     "async_hlc_wid_stream",
     "async_next_hlc_wid",
     "async_next_wid",
+    "async_next_wid_batch",
     "async_wid_stream",
+    "next_hlc_wid_sync",
+    "next_wid_sync",
     "parse_hlc_wid",
     "parse_wid",
     "validate_hlc_wid",
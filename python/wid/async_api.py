@@ -6,8 +6,14 @@
 from __future__ import annotations
 
 import asyncio
+import atexit
+import contextlib
+import functools
+import random
+import sqlite3
+from dataclasses import dataclass
 from pathlib import Path
-from typing import TYPE_CHECKING, Literal, cast
+from typing import TYPE_CHECKING, Literal
 
 from .hlc import HLCWidGen
 from .wid import WidGen, WidGenState
@@ -18,10 +24,106 @@ if TYPE_CHECKING:
     from typing import Any
 
 
+# SQL text is kept in module-level constants so the exact same string object
+# reaches sqlite3's per-connection statement cache on every call, skipping the
+# parser/planner after the first execution.
+_Q_CREATE = (
+    "CREATE TABLE IF NOT EXISTS wid_state ("
+    "k TEXT PRIMARY KEY, "
+    "last_tick INTEGER NOT NULL, "
+    "last_seq INTEGER NOT NULL)"
+)
+_Q_SELECT = "SELECT last_tick, last_seq FROM wid_state WHERE k=?"
+_Q_UPSERT = (
+    "INSERT INTO wid_state(k, last_tick, last_seq) VALUES(?, ?, ?) "
+    "ON CONFLICT(k) DO UPDATE SET "
+    "last_tick=excluded.last_tick, last_seq=excluded.last_seq"
+)
+_Q_INSERT_IGNORE = (
+    "INSERT OR IGNORE INTO wid_state(k,last_tick,last_seq) VALUES(?,0,-1)"
+)
+# RETURNING needs SQLite >= 3.35 (shipped with CPython >= 3.10's bundled
+# sqlite3 on all supported platforms).
+_Q_UPDATE_RETURNING = (
+    "UPDATE wid_state SET last_tick=?,last_seq=? "
+    "WHERE k=? RETURNING last_tick,last_seq"
+)
+
+
+# Built once at import: the per-call set literal allocated (and hashed into)
+# a fresh set on every parse.
+_TIME_UNITS: frozenset[str] = frozenset(("sec", "ms"))
+
+# Database paths whose schema has already been created in this process. The
+# DDL is idempotent, so this only saves the redundant round trip when many
+# short-lived stores point at the same file.
+_INITIALIZED_PATHS: set[str] = set()
+
+# Parent directories already ensured to exist, so repeat store construction
+# against the same database skips the stat/mkdir syscalls.
+_INITIALIZED_PARENTS: set[str] = set()
+
+
+# One HLC generator per (node, w, z), shared by async_next_hlc_wid and
+# async_hlc_wid_stream. Reuse keeps the hybrid clock advancing monotonically
+# across calls instead of rebuilding (and discarding) state each time. next()
+# is synchronous and never awaits, so the event loop serializes access; no
+# lock is needed.
+_HLC_GENS: dict[tuple[str, int, int], HLCWidGen] = {}
+
+
+def _hlc_gen(node: str, w: int, z: int) -> HLCWidGen:
+    key = (node, w, z)
+    gen = _HLC_GENS.get(key)
+    if gen is None:
+        gen = _HLC_GENS.setdefault(key, HLCWidGen(node, W=w, Z=z))
+    return gen
+
+
+def _next_deadline(
+    loop: asyncio.AbstractEventLoop, deadline: float, interval: float
+) -> tuple[float, float]:
+    """Advance an absolute pacing deadline, returning (deadline, delay).
+
+    Scheduling against absolute loop.time() deadlines keeps the average rate
+    exact: sleeping a fixed interval after each emit compounds the per-sleep
+    overshoot into drift. If the stream slipped by more than one interval
+    (consumer stall, suspended laptop), the deadline is re-anchored to now
+    instead of bursting to catch up.
+    """
+    deadline += interval
+    delay = deadline - loop.time()
+    if delay < -interval:
+        deadline = loop.time()
+        delay = 0.0
+    return deadline, delay
+
+
+def _wz(kwargs: dict[str, Any], w: int, z: int) -> tuple[int, int]:
+    # One aliasing helper for every entry point that accepts both `W`/`w` and
+    # `Z`/`z`. pop-with-default avoids the membership-test-then-pop double
+    # lookup; the signature-bound spelling never lands in kwargs, so at most
+    # one alias exists per letter.
+    w = int(kwargs.pop("w", kwargs.pop("W", w)))
+    z = int(kwargs.pop("z", kwargs.pop("Z", z)))
+    return w, z
+
+
 def _parse_time_unit(value: str) -> Literal["sec", "ms"]:
-    if value not in {"sec", "ms"}:
+    if value not in _TIME_UNITS:
         raise ValueError("time_unit must be 'sec' or 'ms'")
-    return cast(Literal["sec", "ms"], value)
+    # equality narrowing keeps the Literal return type without cast()
+    return "ms" if value == "ms" else "sec"
+
+
+@dataclass(frozen=True, slots=True)
+class _AllocRequest:
+    """One queued allocation: resolved by the store's writer task."""
+
+    full_key: str
+    gen: WidGen
+    n: int
+    future: asyncio.Future[list[str]]
 
 
 class AsyncSqliteWidStateStore:
@@ -30,125 +132,341 @@ class AsyncSqliteWidStateStore:
     def __init__(self, database_path: str, prefix: str = "wid") -> None:
         """Create an async SQLite state store."""
         self._database_path = Path(database_path)
-        self._database_path.parent.mkdir(parents=True, exist_ok=True)
+        parent = str(self._database_path.parent)
+        if parent not in _INITIALIZED_PARENTS:
+            self._database_path.parent.mkdir(parents=True, exist_ok=True)
+            _INITIALIZED_PARENTS.add(parent)
         self._prefix = prefix
+        self._conn: Any | None = None
+        self._init_lock = asyncio.Lock()
+        # Keys whose state row is known to exist; lets the writer skip the
+        # bootstrap INSERT after the first successful allocation per key.
+        self._bootstrapped: set[str] = set()
+        # Single-writer pipeline: allocation requests are queued and drained
+        # by one background task, so concurrent callers share a transaction
+        # (and its fsync) instead of each paying their own commit.
+        self._queue: asyncio.Queue[_AllocRequest] | None = None
+        self._writer_task: asyncio.Task[None] | None = None
 
     def _full_key(self, key: str) -> str:
         return f"{self._prefix}:{key}"
 
-    async def _connect(self) -> Any:
-        try:
-            import aiosqlite  # pylint: disable=import-outside-toplevel
-        except ModuleNotFoundError as exc:  # pragma: no cover
-            raise RuntimeError(
-                "aiosqlite is required for async SQLite state. Install with: pip install aiosqlite"
-            ) from exc
-        conn = await aiosqlite.connect(str(self._database_path))
-        q = (
-            "CREATE TABLE IF NOT EXISTS wid_state ("
-            "k TEXT PRIMARY KEY, "
-            "last_tick INTEGER NOT NULL, "
-            "last_seq INTEGER NOT NULL)"
-        )
-        await conn.execute(q)
-        await conn.commit()
-        return conn
+    async def _conn_once(self) -> Any:
+        # One connection per store: aiosqlite.connect spins up a background
+        # thread and the DDL re-parses per connection, so do both exactly once.
+        if self._conn is not None:
+            return self._conn
+        async with self._init_lock:
+            if self._conn is not None:
+                return self._conn
+            try:
+                import aiosqlite  # pylint: disable=import-outside-toplevel
+            except ModuleNotFoundError as exc:  # pragma: no cover
+                raise RuntimeError(
+                    "aiosqlite is required for async SQLite state. Install with: pip install aiosqlite"
+                ) from exc
+            # 128 cached statements (not more): sqlite3's statement cache
+            # had recycling issues with large caches before CPython 3.12.2.
+            # isolation_level=None: transactions are managed explicitly with
+            # BEGIN IMMEDIATE in next_wid.
+            conn = aiosqlite.connect(
+                str(self._database_path),
+                cached_statements=128,
+                isolation_level=None,
+            )
+            # Daemonize the worker thread before awaiting starts it:
+            # interpreter shutdown joins non-daemon threads *before* atexit
+            # handlers run, so a cached store's thread could never be stopped
+            # "later" -- it would deadlock the join instead. The atexit hook
+            # below still closes cleanly when the thread gets the chance.
+            with contextlib.suppress(AttributeError):
+                conn._thread.daemon = True  # pylint: disable=protected-access
+            conn = await conn
+            # WAL lets readers proceed during the writer's transaction and
+            # turns commits into sequential log appends; synchronous=NORMAL
+            # drops the per-commit fsync to a WAL-checkpoint fsync (durable
+            # against app crash, bounded loss on power loss). The busy
+            # timeout backstops the Python-level lock retry for cross-process
+            # contention.
+            await conn.execute("PRAGMA journal_mode=WAL")
+            await conn.execute("PRAGMA synchronous=NORMAL")
+            await conn.execute("PRAGMA temp_store=MEMORY")
+            await conn.execute("PRAGMA cache_size=-64000")
+            await conn.execute("PRAGMA busy_timeout=5000")
+            db_key = str(self._database_path.resolve())
+            if db_key not in _INITIALIZED_PATHS:
+                await conn.execute(_Q_CREATE)
+                await conn.commit()
+                _INITIALIZED_PATHS.add(db_key)
+            self._conn = conn
+            return conn
+
+    async def aclose(self) -> None:
+        """Stop the writer task and close the connection (if opened)."""
+        if self._writer_task is not None:
+            task, self._writer_task = self._writer_task, None
+            # cancel() itself can raise if the task's loop is already closed
+            # (a cached store being torn down from a different loop).
+            with contextlib.suppress(BaseException):
+                task.cancel()
+                await task
+        if self._queue is not None:
+            closed = RuntimeError("store closed")
+            while not self._queue.empty():
+                req = self._queue.get_nowait()
+                if not req.future.done():
+                    req.future.set_exception(closed)
+        if self._conn is not None:
+            conn, self._conn = self._conn, None
+            await conn.close()
+
+    async def __aenter__(self) -> AsyncSqliteWidStateStore:
+        """Enter the async context, opening the connection eagerly."""
+        await self._conn_once()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        """Exit the async context, closing the connection."""
+        await self.aclose()
+
+    async def load_raw(self, key: str) -> tuple[int, int] | None:
+        """Load state for key as a bare (last_sec, last_seq) pair.
+
+        Skips the WidGenState allocation; callers that only feed
+        `WidGen.restore_state` do not need the wrapper object. The INTEGER
+        columns come back as Python ints already.
+        """
+        conn = await self._conn_once()
+        async with conn.execute(_Q_SELECT, (self._full_key(key),)) as cur:
+            row = await cur.fetchone()
+        if row is None:
+            return None
+        last_sec, last_seq = row
+        return last_sec, last_seq
 
     async def load(self, key: str) -> WidGenState | None:
         """Load state for key."""
-        conn = await self._connect()
-        try:
-            async with conn.execute(
-                "SELECT last_tick, last_seq FROM wid_state WHERE k=?",
-                (self._full_key(key),),
-            ) as cur:
-                row = await cur.fetchone()
-            if row is None:
-                return None
-            return WidGenState(last_sec=int(row[0]), last_seq=int(row[1]))
-        finally:
-            await conn.close()
+        raw = await self.load_raw(key)
+        if raw is None:
+            return None
+        return WidGenState(last_sec=raw[0], last_seq=raw[1])
 
     async def save(self, key: str, state: WidGenState) -> None:
         """Save state for key."""
-        conn = await self._connect()
-        try:
-            q_s =(
-                "INSERT INTO wid_state(k, last_tick, last_seq) VALUES(?, ?, ?) "
-                "ON CONFLICT(k) DO UPDATE SET "
-                "last_tick=excluded.last_tick, last_seq=excluded.last_seq"
-            )
-            q_p = (self._full_key(key), state.last_sec, state.last_seq)
-            await conn.execute(q_s, q_p)
-            await conn.commit()
-        finally:
-            await conn.close()
+        conn = await self._conn_once()
+        q_p = (self._full_key(key), state.last_sec, state.last_seq)
+        await conn.execute(_Q_UPSERT, q_p)
+        await conn.commit()
 
     async def next_wid(
-        self, *, key: str = "wid", w: int = 4, z: int = 6, time_unit: str = "sec"
+        self,
+        *,
+        key: str = "wid",
+        w: int = 4,
+        z: int = 6,
+        time_unit: Literal["sec", "ms"] = "sec",
     ) -> str:
-        """Allocate one next WID with SQL compare-and-swap semantics."""
-        full_key = self._full_key(key)
-        conn = await self._connect()
-        try:
-            await conn.execute(
-                "INSERT OR IGNORE INTO wid_state(k,last_tick,last_seq) VALUES(?,0,-1)",
-                (full_key,),
-            )
-            await conn.commit()
-            while True:
-                async with conn.execute(
-                    "SELECT last_tick,last_seq FROM wid_state WHERE k=?",
-                    (full_key,),
-                ) as cur:
-                    row = await cur.fetchone()
-                if row is None:
-                    raise RuntimeError("sql state row missing")
-                last_sec = int(row[0])
-                last_seq = int(row[1])
-                gen = WidGen(w=w, z=z, time_unit=_parse_time_unit(time_unit))
-                gen.restore_state(last_sec, last_seq)
-                out = gen.next()
-                st = gen.state()
-                q_s = (
-                    "UPDATE wid_state SET last_tick=?,last_seq=? "
-                    "WHERE k=? AND last_tick=? AND last_seq=?"
+        """Allocate one next WID atomically under SQLite's write lock."""
+        batch = await self.next_batch(1, key=key, w=w, z=z, time_unit=time_unit)
+        return batch[0]
+
+    async def next_batch(
+        self,
+        n: int,
+        *,
+        key: str = "wid",
+        w: int = 4,
+        z: int = 6,
+        time_unit: Literal["sec", "ms"] = "sec",
+    ) -> list[str]:
+        """Reserve the next n WIDs via the single-writer pipeline."""
+        if n <= 0:
+            raise ValueError("n must be >= 1")
+        # Built once, outside the writer; WidGen validates time_unit, so no
+        # separate parse is needed here.
+        gen = WidGen(w=w, z=z, time_unit=time_unit)
+        await self._conn_once()
+        if self._writer_task is None or self._writer_task.done():
+            self._queue = asyncio.Queue()
+            self._writer_task = asyncio.ensure_future(self._writer_loop())
+        assert self._queue is not None
+        future: asyncio.Future[list[str]] = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait(_AllocRequest(self._full_key(key), gen, n, future))
+        return await future
+
+    async def _allocate_in_txn(self, conn: Any, req: _AllocRequest) -> list[str]:
+        # Runs inside the writer's open transaction. Later requests for the
+        # same key in one batch observe the uncommitted state of earlier ones.
+        if req.full_key not in self._bootstrapped:
+            await conn.execute(_Q_INSERT_IGNORE, (req.full_key,))
+        async with conn.execute(_Q_SELECT, (req.full_key,)) as cur:
+            row = await cur.fetchone()
+        if row is None:
+            raise RuntimeError("sql state row missing")
+        # default tuple row_factory: unpack once instead of indexing twice,
+        # and skip int() -- INTEGER columns are already Python ints
+        last_sec, last_seq = row
+        req.gen.restore_state(last_sec, last_seq)
+        # next_n emits same-second runs with a shared timestamp string; only
+        # the final (last_sec, last_seq) is written back.
+        out = req.gen.next_n(req.n)
+        st = req.gen.state()
+        # Consume (and close) the RETURNING cursor before COMMIT; SQLite
+        # refuses to commit with statements in progress.
+        async with conn.execute(
+            _Q_UPDATE_RETURNING, (st.last_sec, st.last_seq, req.full_key)
+        ) as cur:
+            await cur.fetchone()
+        return out
+
+    async def _writer_loop(self) -> None:
+        # Sole writer for this store: drains queued requests and serves up to
+        # 64 of them per BEGIN IMMEDIATE transaction, amortizing one commit
+        # (and its fsync) over every caller waiting in the batch.
+        conn = await self._conn_once()
+        queue = self._queue
+        assert queue is not None
+        while True:
+            batch = [await queue.get()]
+            while len(batch) < 64 and not queue.empty():
+                batch.append(queue.get_nowait())
+            if not await self._begin_immediate(conn):
+                err = RuntimeError(
+                    "sql allocation contention: retry budget exhausted"
                 )
-                q_p = (st.last_sec, st.last_seq, full_key, last_sec, last_seq)
-                cur2 = await conn.execute(q_s, q_p)
-                await conn.commit()
-                if cur2.rowcount == 1:
-                    return out
-                await asyncio.sleep(0)
-        finally:
-            await conn.close()
+                for req in batch:
+                    if not req.future.done():
+                        req.future.set_exception(err)
+                continue
+            try:
+                results = [
+                    (req, await self._allocate_in_txn(conn, req)) for req in batch
+                ]
+                await conn.execute("COMMIT")
+            except BaseException as exc:
+                with contextlib.suppress(Exception):
+                    await conn.execute("ROLLBACK")
+                failure = (
+                    RuntimeError("store closed")
+                    if isinstance(exc, asyncio.CancelledError)
+                    else exc
+                )
+                for req in batch:
+                    if not req.future.done():
+                        req.future.set_exception(failure)
+                if isinstance(exc, asyncio.CancelledError):
+                    raise
+                continue
+            for req, out in results:
+                self._bootstrapped.add(req.full_key)
+                if not req.future.done():
+                    req.future.set_result(out)
+
+    async def _begin_immediate(self, conn: Any) -> bool:
+        # BEGIN IMMEDIATE serializes writers at the database lock. Only
+        # acquiring the lock can fail (another process holds it), and that is
+        # retried with randomized exponential backoff so contended writers
+        # spread out instead of retrying in lockstep.
+        for attempt in range(64):
+            try:
+                await conn.execute("BEGIN IMMEDIATE")
+            except sqlite3.OperationalError:
+                cap = min(0.0005 * (1 << min(attempt, 10)), 0.1)
+                await asyncio.sleep(random.uniform(0, cap))
+                continue
+            return True
+        return False
+
+
+def next_wid_sync(W: int = 4, Z: int = 6, **kwargs: Any) -> str:
+    """Get one WID without event-loop involvement.
+
+    Synchronous sibling of `async_next_wid` for the no-database case: the
+    work is pure CPU, so callers that can use it skip the coroutine-frame
+    allocation and loop step the async wrapper costs per call.
+    """
+    W, Z = _wz(kwargs, W, Z)  # pyright: ignore[reportConstantRedefinition]
+    return WidGen(W, Z).next()
+
+
+def next_hlc_wid_sync(node: str = "py", w: int = 4, z: int = 0, **kwargs: Any) -> str:
+    """Get one HLC-WID without event-loop involvement."""
+    w, z = _wz(kwargs, w, z)
+    return _hlc_gen(node, w, z).next()
+
+
+# Memoized per (database_path, prefix) so repeated async_next_wid calls reuse
+# one store -- and therefore one connection and statement cache -- instead of
+# opening and closing a connection per allocated ID. Cached stores are bound
+# to whichever running loop first touches their connection; processes that mix
+# loops should manage AsyncSqliteWidStateStore instances explicitly.
+_CACHED_STORES: list[AsyncSqliteWidStateStore] = []
+
+
+@functools.lru_cache(maxsize=32)
+def _get_store(database_path: str, prefix: str) -> AsyncSqliteWidStateStore:
+    store = AsyncSqliteWidStateStore(database_path, prefix=prefix)
+    _CACHED_STORES.append(store)
+    return store
+
+
+@atexit.register
+def _close_cached_stores() -> None:  # pragma: no cover
+    # aiosqlite's worker thread is non-daemon, so a connection left open
+    # would block interpreter shutdown on the thread join. The loop the
+    # store ran on is usually closed by now, which rules out awaiting
+    # aclose(); Connection.stop() hands the close to the worker thread
+    # directly without needing any event loop.
+    for store in _CACHED_STORES:
+        conn, store._conn = store._conn, None  # pylint: disable=protected-access
+        store._writer_task = None  # pylint: disable=protected-access
+        if conn is None:
+            continue
+        try:
+            conn.stop()
+        except Exception:  # pylint: disable=broad-exception-caught
+            continue
 
 
 async def async_next_wid(W: int = 4, Z: int = 6, **kwargs: Any) -> str:
     """Get one WID in async contexts."""
-    if "w" in kwargs:
-        W = int(kwargs.pop("w"))  # pyright: ignore[reportConstantRedefinition]
-    if "z" in kwargs:
-        Z = int(kwargs.pop("z"))  # pyright: ignore[reportConstantRedefinition]
+    W, Z = _wz(kwargs, W, Z)  # pyright: ignore[reportConstantRedefinition]
     database_path = kwargs.pop("database_path", None)
     if database_path is None:
+        # no-I/O fast path: return immediately, nothing to await
         return WidGen(W, Z).next()
     prefix = str(kwargs.pop("prefix", "wid"))
     state_key = str(kwargs.pop("state_key", "wid"))
     time_unit = str(kwargs.pop("time_unit", "sec"))
-    store = AsyncSqliteWidStateStore(str(database_path), prefix=prefix)
+    store = _get_store(str(database_path), prefix)
     return await store.next_wid(
         key=state_key, w=W, z=Z, time_unit=_parse_time_unit(time_unit)
     )
 
 
+async def async_next_wid_batch(n: int, W: int = 4, Z: int = 6, **kwargs: Any) -> list[str]:
+    """Reserve the next n WIDs in one shot in async contexts.
+
+    With a database path the whole batch is allocated inside a single write
+    transaction, amortizing one commit over n ids instead of paying it per
+    call; without one it is a plain in-process next_n.
+    """
+    W, Z = _wz(kwargs, W, Z)  # pyright: ignore[reportConstantRedefinition]
+    database_path = kwargs.pop("database_path", None)
+    if database_path is None:
+        return WidGen(W, Z).next_n(n)
+    prefix = str(kwargs.pop("prefix", "wid"))
+    state_key = str(kwargs.pop("state_key", "wid"))
+    time_unit = str(kwargs.pop("time_unit", "sec"))
+    store = _get_store(str(database_path), prefix)
+    return await store.next_batch(
+        n, key=state_key, w=W, z=Z, time_unit=_parse_time_unit(time_unit)
+    )
+
+
 async def async_next_hlc_wid(node: str = "py", w: int = 4, z: int = 0, **kwargs: Any) -> str:
     """Get one HLC-WID in async contexts."""
-    if "W" in kwargs:
-        w = int(kwargs.pop("W"))
-    if "Z" in kwargs:
-        z = int(kwargs.pop("Z"))
-    return HLCWidGen(node, w=w, z=z).next()
+    return next_hlc_wid_sync(node, w, z, **kwargs)
 
 
 async def async_wid_stream(
@@ -168,10 +486,7 @@ async def async_wid_stream(
     if interval_ms < 0:
         raise ValueError("interval_ms must be >= 0")
 
-    if "W" in kwargs:
-        w = int(kwargs.pop("W"))
-    if "Z" in kwargs:
-        z = int(kwargs.pop("Z"))
+    w, z = _wz(kwargs, w, z)
     database_path = kwargs.pop("database_path", None)
     prefix = str(kwargs.pop("prefix", "wid"))
     state_key = str(kwargs.pop("state_key", "wid"))
@@ -184,17 +499,42 @@ async def async_wid_stream(
     )
     gen = WidGen(w=w, z=z, time_unit=parsed_time_unit) if store is None else None
     emitted = 0
-    while count == 0 or emitted < count:
+    interval = interval_ms / 1000.0
+    loop = asyncio.get_running_loop()
+    deadline = loop.time()
+    try:
+        while count == 0 or emitted < count:
+            if store is not None:
+                # Amortize the SQL round trip: reserve a batch per write
+                # transaction unless pacing requires one-at-a-time emission.
+                if interval_ms > 0:
+                    batch = 1
+                elif count == 0:
+                    batch = 256
+                else:
+                    batch = min(count - emitted, 256)
+                allocated = await store.next_batch(
+                    batch, key=state_key, w=w, z=z, time_unit=parsed_time_unit
+                )
+                for wid_value in allocated:
+                    yield wid_value
+                    emitted += 1
+                    if interval_ms > 0:
+                        deadline, delay = _next_deadline(loop, deadline, interval)
+                        await asyncio.sleep(delay)
+                    else:
+                        # keep a cancellation point between buffered yields
+                        await asyncio.sleep(0)
+            else:
+                assert gen is not None
+                yield gen.next()
+                emitted += 1
+                if interval_ms > 0:
+                    deadline, delay = _next_deadline(loop, deadline, interval)
+                    await asyncio.sleep(delay)
+    finally:
         if store is not None:
-            yield await store.next_wid(
-                key=state_key, w=w, z=z, time_unit=parsed_time_unit
-            )
-        else:
-            assert gen is not None
-            yield gen.next()
-        emitted += 1
-        if interval_ms > 0:
-            await asyncio.sleep(interval_ms / 1000.0)
+            await store.aclose()
 
 
 async def async_hlc_wid_stream(
@@ -215,14 +555,15 @@ async def async_hlc_wid_stream(
     if interval_ms < 0:
         raise ValueError("interval_ms must be >= 0")
 
-    if "w" in kwargs:
-        W = int(kwargs.pop("w")) # pyright: ignore[reportConstantRedefinition]
-    if "z" in kwargs:
-        Z = int(kwargs.pop("z")) # pyright: ignore[reportConstantRedefinition]
-    gen = HLCWidGen(node, W=W, Z=Z)
+    W, Z = _wz(kwargs, W, Z)  # pyright: ignore[reportConstantRedefinition]
+    gen = _hlc_gen(node, W, Z)
     emitted = 0
+    interval = interval_ms / 1000.0
+    loop = asyncio.get_running_loop()
+    deadline = loop.time()
     while count == 0 or emitted < count:
         yield gen.next()
         emitted += 1
         if interval_ms > 0:
-            await asyncio.sleep(interval_ms / 1000.0)
+            deadline, delay = _next_deadline(loop, deadline, interval)
+            await asyncio.sleep(delay)
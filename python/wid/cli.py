@@ -8,24 +8,32 @@
 from __future__ import annotations
 
 import argparse
+import asyncio
 import base64
+import calendar
 import hashlib
 import hmac
 import json
 import os
+import re
+import shlex
 import shutil
 import signal
 import sqlite3
+import struct
 import subprocess
 import sys
 import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, Literal
 
 from .core import WidCore
 from .hlc import HLCWidGen
-from .parse import parse_hlc_wid, parse_wid, validate_hlc_wid, validate_wid
+from .parse import _is_ascii_digits, parse_hlc_wid, parse_wid, validate_hlc_wid, validate_wid
 from .wid import WidGen
 
 if TYPE_CHECKING:
@@ -66,6 +74,18 @@ ACTION_ALIASES = {
 }
 LOCAL_SERVICE_TRANSPORTS = {"mqtt", "ws", "redis", "null", "stdout", "auto"}
 
+# Canonical KEY=VALUE shape and key membership validated in one C-level regex
+# pass per token instead of a split plus set lookup; longest alternatives
+# first so e.g. MAX_AGE_SEC is not half-matched as M.
+_CANON_ARG_RE = re.compile(
+    "^("
+    "MAX_FUTURE_SEC|MAX_AGE_SEC|DIGITS|MODE|CODE|DATA|WID|KEY|SIG|OUT"
+    "|[WALDIEZTRMN]"
+    ")=(.*)$",
+    re.DOTALL,
+)
+_CANON_INT_RE = re.compile(r"[0-9]+$")
+
 
 def _print_actions() -> None:
     print("""wid action matrix
@@ -123,8 +143,23 @@ Environment:
     )
 
 
+# Pre-encoded jsonl skeletons per kind: the record shape is fixed, so the
+# hot path can splice id and timestamp into a template instead of building a
+# dict and running the json encoder per emission.
+_KIND_FRAGS = {
+    "wid": '","kind":"wid","generated_at":"',
+    "hlc": '","kind":"hlc","generated_at":"',
+}
+
+
 def _emit_record(id_value: str, kind: str, out_format: str) -> str:
     if out_format == "jsonl":
+        frag = _KIND_FRAGS.get(kind)
+        # Well-formed IDs never contain characters that need JSON escaping;
+        # anything surprising falls back to the real encoder.
+        if frag is not None and '"' not in id_value and "\\" not in id_value:
+            generated_at = datetime.now(tz=timezone.utc).isoformat()
+            return f'{{"id":"{id_value}{frag}{generated_at}"}}'
         return json.dumps(
             {
                 "id": id_value,
@@ -136,6 +171,33 @@ def _emit_record(id_value: str, kind: str, out_format: str) -> str:
     return id_value
 
 
+def _sleep_to_deadline(deadline: float, period: float) -> float:
+    """Advance an absolute monotonic deadline and sleep the remainder.
+
+    Sleeping a fixed period after each emit lets the work time accumulate as
+    drift; scheduling against absolute deadlines keeps the cadence exact. If
+    the loop slipped by more than one period (stalled consumer, suspend), the
+    deadline re-anchors to now instead of bursting to catch up.
+    """
+    deadline += period
+    now = time.monotonic()
+    if deadline < now - period:
+        deadline = now
+    remaining = deadline - now
+    if remaining > 0.0:
+        if period < 1e-3:
+            # Sub-millisecond cadence: time.sleep wakes late by the OS timer
+            # slack, which here would exceed the whole period. Sleep short
+            # and busy-spin the final ~0.5 ms to hit the deadline.
+            if remaining > 1e-3:
+                time.sleep(remaining - 5e-4)
+            while time.monotonic() < deadline:
+                pass
+        else:
+            time.sleep(remaining)
+    return deadline
+
+
 def _env_int(name: str, default: int) -> int:
     raw = os.environ.get(name)
     if raw is None:
@@ -175,6 +237,12 @@ def _run_emit_mode(mode: str, argv: list[str]) -> None:
         default=max(1, _env_int("L", 1000)),
     )
     ap.add_argument("--healthcheck-cmd", type=str, default="")
+    ap.add_argument(
+        "--flush-every",
+        type=int,
+        default=0,
+        help="records per stdout flush; 0 = auto (256 when --interval-ms 0, else 1)",
+    )
     args = ap.parse_args(argv)
 
     gen: Callable[[], str]
@@ -191,27 +259,130 @@ def _run_emit_mode(mode: str, argv: list[str]) -> None:
         print(_emit_record(gen(), args.kind, args.format), flush=True)
         return
 
-    emitted = 0
-    try:
-        while args.count == 0 or emitted < args.count:
-            print(_emit_record(gen(), args.kind, args.format), flush=True)
-            emitted += 1
-            if (
-                args.healthcheck_cmd
-                and args.cadence > 0
-                and emitted % args.cadence == 0
-            ):
-                rc = subprocess.run(args.healthcheck_cmd, shell=True).returncode
+    period = args.interval_ms / 1000.0
+    # Flushing every record costs a syscall per ID, which dominates unpaced
+    # stream mode. Batch writes there; paced (or explicitly flush-every=1)
+    # streams keep line-at-a-time delivery for interactive consumers.
+    flush_every = args.flush_every
+    if flush_every <= 0:
+        flush_every = 256 if args.interval_ms == 0 else 1
+    # Split once and exec directly: no /bin/sh fork per check.
+    hc_argv = shlex.split(args.healthcheck_cmd) if args.healthcheck_cmd else []
+
+    async def _stream() -> int:
+        # The stream runs as a coroutine so the healthcheck subprocess is
+        # awaited by the event loop and overlaps the next cadence of emits;
+        # pacing uses absolute loop-time deadlines to avoid drift.
+        out = sys.stdout
+        buf: list[str] = []
+        emitted = 0
+        loop = asyncio.get_running_loop()
+        deadline = loop.time()
+        pending_hc: asyncio.subprocess.Process | None = None
+        # Locals resolve ~3-5x faster than globals/attributes in CPython;
+        # bind the per-record callables once. Plain text output skips
+        # _emit_record entirely.
+        gen_next = gen
+        kind = args.kind
+        out_format = args.format
+        append = buf.append
+        text_format = out_format == "text"
+
+        async def _reap(proc: asyncio.subprocess.Process) -> int:
+            rc = proc.returncode
+            if rc is None:
+                rc = await proc.wait()
+            if rc != 0:
+                print(
+                    f"Healthcheck command failed with exit code {rc}",
+                    file=sys.stderr,
+                )
+            return rc
+
+        try:
+            while args.count == 0 or emitted < args.count:
+                append(
+                    gen_next()
+                    if text_format
+                    else _emit_record(gen_next(), kind, out_format)
+                )
+                if len(buf) >= flush_every:
+                    out.write("\n".join(buf) + "\n")
+                    out.flush()
+                    buf.clear()
+                emitted += 1
+                if hc_argv and args.cadence > 0 and emitted % args.cadence == 0:
+                    if pending_hc is not None:
+                        rc = await _reap(pending_hc)
+                        pending_hc = None
+                        if rc != 0:
+                            return rc
+                    # stdout is discarded but stderr is inherited so a failing
+                    # check's own diagnostics reach the operator alongside the
+                    # exit-code message below.
+                    try:
+                        pending_hc = await asyncio.create_subprocess_exec(
+                            *hc_argv,
+                            stdout=subprocess.DEVNULL,
+                        )
+                    except OSError:
+                        # Missing or unspawnable binary: report it like the
+                        # shell would (command not found => 127) instead of
+                        # letting the traceback take down the stream.
+                        print(
+                            "Healthcheck command failed with exit code 127",
+                            file=sys.stderr,
+                        )
+                        return 127
+                if args.interval_ms > 0:
+                    deadline += period
+                    delay = deadline - loop.time()
+                    if delay < -period:
+                        deadline = loop.time()
+                        delay = 0.0
+                    await asyncio.sleep(max(0.0, delay))
+            if pending_hc is not None:
+                rc = await _reap(pending_hc)
                 if rc != 0:
-                    print(
-                        f"Healthcheck command failed with exit code {rc}",
-                        file=sys.stderr,
-                    )
-                    sys.exit(rc)
-            if args.interval_ms > 0:
-                time.sleep(args.interval_ms / 1000.0)
+                    return rc
+            return 0
+        finally:
+            # drain whatever a partial batch (or cancellation) left behind
+            if buf:
+                out.write("\n".join(buf) + "\n")
+                out.flush()
+
+    try:
+        rc = asyncio.run(_stream())
     except KeyboardInterrupt:
         sys.exit(130)
+    if rc != 0:
+        sys.exit(rc)
+
+
+def _healthcheck_one(
+    kind: str, w_val: int, z_val: int, node: str, time_unit: str
+) -> dict[str, Any]:
+    effective_time_unit = WidCore.TimeUnit.from_string(time_unit)
+    if kind == "wid":
+        sample = WidGen(w=w_val, z=z_val, time_unit=effective_time_unit).next()
+        ok = validate_wid(sample, W=w_val, Z=z_val, time_unit=effective_time_unit)
+    else:
+        sample = HLCWidGen(
+            node,
+            w=w_val,
+            z=z_val,
+            time_unit=effective_time_unit,
+        ).next()
+        ok = validate_hlc_wid(sample, W=w_val, Z=z_val, time_unit=effective_time_unit)
+    return {
+        "ok": bool(ok),
+        "kind": kind,
+        "W": w_val,
+        "Z": z_val,
+        "sample_id": sample,
+        "time_unit": time_unit,
+    }
 
 
 def _run_healthcheck_mode(argv: list[str]) -> None:
@@ -225,30 +396,56 @@ def _run_healthcheck_mode(argv: list[str]) -> None:
         choices=["sec", "ms"],
         default=os.environ.get("WID_TIME_UNIT", "sec"),
     )
+    ap.add_argument(
+        "--config",
+        type=str,
+        default="",
+        help="JSON file with a list of {kind, W, Z, node, time_unit} specs",
+    )
     ap.add_argument("--json", action="store_true")
     args = ap.parse_args(argv)
 
-    effective_time_unit = WidCore.TimeUnit.from_string(args.time_unit)
-    ok: bool = False
-    if args.kind == "wid":
-        sample = WidGen(w=args.W, z=args.Z, time_unit=effective_time_unit).next()
-        ok = validate_wid(sample, W=args.W, Z=args.Z, time_unit=effective_time_unit)
-    else:
-        sample = HLCWidGen(
-            args.node,
-            w=args.W,
-            z=args.Z,
-            time_unit=effective_time_unit,
-        ).next()
-        ok = validate_hlc_wid(sample, W=args.W, Z=args.Z, time_unit=effective_time_unit)
+    if args.config:
+        raw = json.loads(Path(args.config).read_text(encoding="utf-8"))
+        specs = [
+            (
+                str(item.get("kind", "wid")),
+                int(item.get("W", args.W)),
+                int(item.get("Z", args.Z)),
+                str(item.get("node", args.node)),
+                str(item.get("time_unit", args.time_unit)),
+            )
+            for item in raw
+        ]
+        # Checks are independent, so run them concurrently: total latency is
+        # the slowest check rather than the sum of all of them. An empty
+        # config stays a healthy no-op (ThreadPoolExecutor rejects
+        # max_workers=0).
+        checks: list[dict[str, Any]] = []
+        if specs:
+            with ThreadPoolExecutor(max_workers=len(specs)) as pool:
+                checks = list(pool.map(lambda sp: _healthcheck_one(*sp), specs))
+        ok = all(c["ok"] for c in checks)
+        payload: dict[str, Any] = {
+            "ok": ok,
+            "checks": checks,
+            "checked_at": datetime.now(tz=timezone.utc).isoformat(),
+        }
+        if args.json:
+            print(json.dumps(payload, separators=(",", ":")))
+        else:
+            for c in checks:
+                ok_str = str(c["ok"]).lower()
+                print(f"ok={ok_str} kind={c['kind']} sample={c['sample_id']}")
+        if not ok:
+            sys.exit(1)
+        return
 
+    check = _healthcheck_one(args.kind, args.W, args.Z, args.node, args.time_unit)
+    ok = check["ok"]
+    sample = check["sample_id"]
     payload = {
-        "ok": bool(ok),
-        "kind": args.kind,
-        "W": args.W,
-        "Z": args.Z,
-        "sample_id": sample,
-        "time_unit": args.time_unit,
+        **check,
         "checked_at": datetime.now(tz=timezone.utc).isoformat(),
     }
 
@@ -265,6 +462,9 @@ def _is_true(raw: str) -> bool:
     return raw.strip().lower() in {"1", "true", "yes", "y", "on"}
 
 
+# Stable for the process lifetime; the parent-directory stat walk is pure
+# overhead after the first lookup.
+@lru_cache(maxsize=1)
 def _repo_root() -> Path | None:
     here = Path(__file__).resolve()
     for parent in [here.parent, *here.parents]:
@@ -291,14 +491,17 @@ def _run_shell_wid(root_dir: Path, canon: dict[str, str]) -> None:
     _run_cmd([str(sh_impl), *args])
 
 
+@lru_cache(maxsize=8)
 def _runtime_dir(root_dir: Path) -> Path:
     return (root_dir / ".local" / "wid" / "python").resolve()
 
 
+@lru_cache(maxsize=8)
 def _pid_file(root_dir: Path) -> Path:
     return _runtime_dir(root_dir) / "service.pid"
 
 
+@lru_cache(maxsize=8)
 def _log_file(root_dir: Path) -> Path:
     return _runtime_dir(root_dir) / "service.log"
 
@@ -306,8 +509,23 @@ def _log_file(root_dir: Path) -> Path:
 def _tail_text(path: Path, n: int = 40) -> str:
     if not path.exists():
         return "no-log\n"
-    with path.open("r", encoding="utf-8", errors="replace") as f:
-        lines = f.readlines()
+    # Read backwards in 8 KiB blocks until n newlines are seen: service logs
+    # grow without bound, and readlines() would load the whole file to throw
+    # most of it away.
+    block = 8192
+    chunks: list[bytes] = []
+    newlines = 0
+    with path.open("rb") as f:
+        pos = f.seek(0, os.SEEK_END)
+        while pos > 0 and newlines <= n:
+            size = min(block, pos)
+            pos -= size
+            f.seek(pos)
+            chunk = f.read(size)
+            chunks.append(chunk)
+            newlines += chunk.count(b"\n")
+    data = b"".join(reversed(chunks))
+    lines = data.decode("utf-8", errors="replace").splitlines(keepends=True)
     return "".join(lines[-n:])
 
 
@@ -326,23 +544,26 @@ def _service_loop_native(
     unit = WidCore.TimeUnit.from_string(time_unit)
     gen = WidGen(w=w_val, z=z_val, time_unit=unit)
     emitted = 0
+    deadline = time.monotonic()
+    # os.write on fd 1 skips the stdio lock and TextIOWrapper encode per
+    # line; IDs are plain ASCII. One write syscall per tick is the floor for
+    # an unbuffered daemon log.
+    stdout_fd = sys.stdout.fileno()
+    gen_next = gen.next
+    write = os.write
+    sql_mode = state_mode == "sql"
+    sql_path = _sql_state_path(data_dir) if sql_mode else None
     while emitted < loops:
         if action == "run":
-            if state_mode == "sql":
-                print(
-                    _sql_allocate_next_wid(
-                        w_val,
-                        z_val,
-                        time_unit,
-                        _sql_state_path(data_dir),
-                    ),
-                    flush=True,
-                )
+            if sql_mode:
+                assert sql_path is not None
+                line = _sql_allocate_next_wid(w_val, z_val, time_unit, sql_path)
             else:
-                print(gen.next(), flush=True)
+                line = gen_next()
+            write(stdout_fd, (line + "\n").encode("ascii"))
         emitted += 1
         if emitted < loops:
-            time.sleep(max(0, l_val))
+            deadline = _sleep_to_deadline(deadline, max(0, l_val))
 
 
 def _start_native_daemon(
@@ -359,17 +580,52 @@ def _start_native_daemon(
     log_path = _log_file(root_dir)
     py = sys.executable or shutil.which("python3") or "python3"
     cmd = [py, "-m", "wid", "__daemon", *args]
-    with log_path.open("a", encoding="utf-8") as logf:
-        proc = subprocess.Popen(  # noqa: S603
-            cmd,
-            cwd=str(root_dir),
-            env=dict(os.environ),
-            stdout=logf,
-            stderr=subprocess.STDOUT,
-            start_new_session=True,
-        )
-    _pid_file(root_dir).write_text(f"{proc.pid}\n", encoding="utf-8")
-    print(f"started python service pid={proc.pid}")
+    # Hand the raw append-mode fd to the child instead of a buffered Python
+    # file object; O_CLOEXEC keeps it out of any processes the service spawns.
+    log_fd = os.open(
+        str(log_path),
+        os.O_WRONLY | os.O_CREAT | os.O_APPEND | os.O_CLOEXEC,
+        0o644,
+    )
+    try:
+        pid = _spawn_daemon(cmd, root_dir, log_fd)
+    finally:
+        os.close(log_fd)
+    _pid_file(root_dir).write_text(f"{pid}\n", encoding="utf-8")
+    print(f"started python service pid={pid}")
+
+
+def _spawn_daemon(cmd: list[str], root_dir: Path, log_fd: int) -> int:
+    # posix_spawn avoids fork()'s page-table copy of the parent interpreter,
+    # which dominates start latency once the process is large. The setsid
+    # flag needs Python >= 3.13; older interpreters fall back to Popen with
+    # start_new_session (fork+exec, same observable behavior).
+    file_actions = [
+        (os.POSIX_SPAWN_DUP2, log_fd, 1),
+        (os.POSIX_SPAWN_DUP2, log_fd, 2),
+    ]
+    saved_cwd = os.getcwd()
+    try:
+        os.chdir(root_dir)
+        try:
+            return os.posix_spawnp(
+                cmd[0],
+                cmd,
+                dict(os.environ),
+                file_actions=file_actions,
+                setsid=True,
+            )
+        except TypeError:
+            proc = subprocess.Popen(  # noqa: S603
+                cmd,
+                env=dict(os.environ),
+                stdout=log_fd,
+                stderr=subprocess.STDOUT,
+                start_new_session=True,
+            )
+            return proc.pid
+    finally:
+        os.chdir(saved_cwd)
 
 
 def _stop_native_daemon(root_dir: Path) -> None:
@@ -434,6 +690,50 @@ def _check_update_native() -> None:
     }, separators=(",", ":")))
 
 
+# SQL text lives in module constants so sqlite3's per-connection statement
+# cache sees the same string object each call and skips re-parse/re-plan.
+_SQL_CREATE = (
+    "CREATE TABLE IF NOT EXISTS wid_state ("
+    "k TEXT PRIMARY KEY, "
+    "last_tick INTEGER NOT NULL, "
+    "last_seq INTEGER NOT NULL)"
+)
+_SQL_BOOTSTRAP = (
+    "INSERT OR IGNORE INTO wid_state(k,last_tick,last_seq) VALUES(?,0,-1)"
+)
+_SQL_SELECT = "SELECT last_tick,last_seq FROM wid_state WHERE k=?"
+_SQL_UPDATE_CAS = (
+    "UPDATE wid_state SET last_tick=?,last_seq=? "
+    "WHERE k=? AND last_tick=? AND last_seq=?"
+)
+
+# One connection per database path per process: service loops allocate every
+# tick, and reconnecting would pay the open + PRAGMA + DDL cost each time.
+_SQL_CONN_CACHE: dict[str, sqlite3.Connection] = {}
+
+# (db path, state key) pairs whose row is known to exist; the bootstrap
+# INSERT runs once per pair instead of on every allocation.
+_SQL_BOOTSTRAPPED: set[tuple[str, str]] = set()
+
+
+def _sql_conn(db_path: Path) -> sqlite3.Connection:
+    key = str(db_path)
+    conn = _SQL_CONN_CACHE.get(key)
+    if conn is None:
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        # isolation_level=None: transactions are managed explicitly with
+        # BEGIN IMMEDIATE in _sql_allocate_next_wid. WAL + synchronous=NORMAL
+        # turns commits into log appends instead of full-database fsyncs.
+        conn = sqlite3.connect(key, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA busy_timeout=5000")
+        conn.execute(_SQL_CREATE)
+        _SQL_CONN_CACHE[key] = conn
+    return conn
+
+
+@lru_cache(maxsize=8)
 def _sql_state_path(data_dir: Path) -> Path:
     return data_dir / "wid_state.sqlite"
 
@@ -448,54 +748,86 @@ def _sql_state_key(w_val: int, z_val: int, time_unit: str) -> str:
 def _sql_allocate_next_wid(
     w_val: int, z_val: int, time_unit: str, db_path: Path
 ) -> str:
-    db_path.parent.mkdir(parents=True, exist_ok=True)
-    conn = sqlite3.connect(str(db_path))
-    try:
-        conn.execute("PRAGMA busy_timeout=5000")
-        q = (
-            "CREATE TABLE IF NOT EXISTS wid_state ("
-            "k TEXT PRIMARY KEY, "
-            "last_tick INTEGER NOT NULL, "
-            "last_seq INTEGER NOT NULL)"
-        )
-        conn.execute(q)
-        key = _sql_state_key(w_val, z_val, time_unit)
-        conn.execute(
-            "INSERT OR IGNORE INTO wid_state(k,last_tick,last_seq) VALUES(?,0,-1)",
-            (key,),
-        )
-        conn.commit()
-
-        for _ in range(64):
-            row = conn.execute(
-                "SELECT last_tick,last_seq FROM wid_state WHERE k=?",
-                (key,),
-            ).fetchone()
+    conn = _sql_conn(db_path)
+    key = _sql_state_key(w_val, z_val, time_unit)
+    boot_key = (str(db_path), key)
+    # Loop-invariant: the unit parse and generator construction do not
+    # depend on the CAS outcome, so build them once and only restore
+    # state per attempt.
+    gen = WidGen(
+        w=w_val,
+        z=z_val,
+        time_unit=WidCore.TimeUnit.from_string(time_unit),
+    )
+    for _ in range(64):
+        # BEGIN IMMEDIATE holds the write lock across bootstrap + SELECT +
+        # UPDATE, so the whole allocation commits (and fsyncs) once. The CAS
+        # WHERE clause is kept as a belt-and-braces check; under the
+        # immediate lock it only fails if another process raced between
+        # retries.
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if boot_key not in _SQL_BOOTSTRAPPED:
+                conn.execute(_SQL_BOOTSTRAP, (key,))
+            row = conn.execute(_SQL_SELECT, (key,)).fetchone()
             if row is None:
                 raise RuntimeError("invalid SQL state row")
 
             last_sec = int(row[0])
             last_seq = int(row[1])
-            gen = WidGen(
-                w=w_val,
-                z=z_val,
-                time_unit=WidCore.TimeUnit.from_string(time_unit),
-            )
             gen.restore_state(last_sec, last_seq)
             wid_id = gen.next()
             st = gen.state()
-            q_s = (
-                "UPDATE wid_state SET last_tick=?,last_seq=? "
-                "WHERE k=? AND last_tick=? AND last_seq=?"
-            )
             q_p = (st.last_sec, st.last_seq, key, last_sec, last_seq)
-            cur = conn.execute(q_s, q_p)
-            conn.commit()
-            if cur.rowcount == 1:
-                return wid_id
-        raise RuntimeError("sql allocation contention: retry budget exhausted")
-    finally:
-        conn.close()
+            cur = conn.execute(_SQL_UPDATE_CAS, q_p)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        if cur.rowcount == 1:
+            _SQL_BOOTSTRAPPED.add(boot_key)
+            return wid_id
+    raise RuntimeError("sql allocation contention: retry budget exhausted")
+
+
+def _sql_allocate_next_wid_batch(
+    w_val: int, z_val: int, time_unit: str, db_path: Path, batch: int
+) -> list[str]:
+    """Reserve `batch` WIDs in one transaction (one commit, one fsync)."""
+    if batch <= 0:
+        raise ValueError("batch must be >= 1")
+    conn = _sql_conn(db_path)
+    key = _sql_state_key(w_val, z_val, time_unit)
+    boot_key = (str(db_path), key)
+    gen = WidGen(
+        w=w_val,
+        z=z_val,
+        time_unit=WidCore.TimeUnit.from_string(time_unit),
+    )
+    for _ in range(64):
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if boot_key not in _SQL_BOOTSTRAPPED:
+                conn.execute(_SQL_BOOTSTRAP, (key,))
+            row = conn.execute(_SQL_SELECT, (key,)).fetchone()
+            if row is None:
+                raise RuntimeError("invalid SQL state row")
+
+            last_sec = int(row[0])
+            last_seq = int(row[1])
+            gen.restore_state(last_sec, last_seq)
+            wids = gen.next_n(batch)
+            st = gen.state()
+            q_p = (st.last_sec, st.last_seq, key, last_sec, last_seq)
+            cur = conn.execute(_SQL_UPDATE_CAS, q_p)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        if cur.rowcount == 1:
+            _SQL_BOOTSTRAPPED.add(boot_key)
+            return wids
+    raise RuntimeError("sql allocation contention: retry budget exhausted")
 
 
 def _run_sign_mode(canon: dict[str, str]) -> None:
@@ -589,10 +921,26 @@ def _resolve_wotp_secret(raw_key: str) -> str:
     return raw_key.strip()
 
 
+# Keyed HMAC states cached per secret: hashing the key pads costs two extra
+# SHA-256 blocks per hmac.new(); copying a prepared state skips them, which
+# matters for verify loops that run many codes against one secret.
+_WOTP_HMAC_CACHE: dict[bytes, hmac.HMAC] = {}
+
+# DIGITS is bounded to 4..10; index instead of recomputing 10**digits.
+_POW10 = [10**i for i in range(11)]
+
+
 def _wotp_code(secret: str, wid: str, digits: int) -> str:
-    digest = hmac.new(secret.encode("utf-8"), wid.encode("utf-8"), hashlib.sha256).digest()
-    binary = int.from_bytes(digest[:4], "big", signed=False)
-    return str(binary % (10**digits)).zfill(digits)
+    secret_bytes = secret.encode("utf-8")
+    base = _WOTP_HMAC_CACHE.get(secret_bytes)
+    if base is None:
+        base = _WOTP_HMAC_CACHE.setdefault(
+            secret_bytes, hmac.new(secret_bytes, b"", hashlib.sha256)
+        )
+    h = base.copy()
+    h.update(wid.encode("utf-8"))
+    binary = struct.unpack_from(">I", h.digest())[0]
+    return f"{binary % _POW10[digits]:0{digits}d}"
 
 
 def _wotp_wid_tick_ms(wid_str: str) -> int:
@@ -602,9 +950,30 @@ def _wotp_wid_tick_ms(wid_str: str) -> int:
     date_part, time_part = ts.split("T", 1)
     if len(date_part) != 8 or len(time_part) not in {6, 9}:
         raise ValueError("WID timestamp is invalid for time-window verification")
-    fmt = "%Y%m%dT%H%M%S%f" if len(time_part) == 9 else "%Y%m%dT%H%M%S"
-    dt = datetime.strptime(ts, fmt).replace(tzinfo=timezone.utc)
-    return int(dt.timestamp() * 1000)
+    # int() tolerates signs and whitespace inside a field ("+1", " 9"), which
+    # strptime's digit classes rejected; require ASCII digits across both
+    # spans before slicing.
+    if not (_is_ascii_digits(date_part) and _is_ascii_digits(time_part)):
+        raise ValueError("WID timestamp is invalid for time-window verification")
+    # The two accepted layouts are fixed-width, so slice-int parsing replaces
+    # the strptime format interpreter. The datetime constructor keeps
+    # strptime's field validation: calendar.timegm alone would fold an
+    # out-of-range day or hour into the epoch instead of rejecting it.
+    try:
+        dt = datetime(
+            int(ts[0:4]),
+            int(ts[4:6]),
+            int(ts[6:8]),
+            int(ts[9:11]),
+            int(ts[11:13]),
+            int(ts[13:15]),
+        )
+        ms = int(ts[15:18]) if len(time_part) == 9 else 0
+    except ValueError as exc:
+        raise ValueError(
+            "WID timestamp is invalid for time-window verification"
+        ) from exc
+    return calendar.timegm(dt.timetuple()) * 1000 + ms
 
 
 def _run_wotp_mode(canon: dict[str, str], w_val: int, z_val: int, time_unit: str) -> None:
@@ -639,14 +1008,19 @@ def _run_wotp_mode(canon: dict[str, str], w_val: int, z_val: int, time_unit: str
     if not wid_str:
         raise ValueError("WID=<wid_string> required for A=w-otp MODE=verify")
 
-    otp = _wotp_code(secret, wid_str, digits)
     if mode == "gen":
+        otp = _wotp_code(secret, wid_str, digits)
         print(json.dumps({"wid": wid_str, "otp": otp, "digits": digits}, separators=(",", ":")))
         return
 
     code = canon.get("CODE", "").strip()
     if not code:
         raise ValueError("CODE=<otp_code> required for A=w-otp MODE=verify")
+    # Fail fast on a malformed code before doing any hashing: length and
+    # digit-ness are not secret, so this leaks nothing.
+    if len(code) != digits or not code.isdigit():
+        print("OTP invalid.", file=sys.stderr, flush=True)
+        sys.exit(1)
     if max_age_sec > 0 or max_future_sec > 0:
         wid_ms = _wotp_wid_tick_ms(wid_str)
         now_ms = int(time.time() * 1000)
@@ -655,6 +1029,7 @@ def _run_wotp_mode(canon: dict[str, str], w_val: int, z_val: int, time_unit: str
             raise ValueError("OTP invalid: WID timestamp is too far in the future")
         if delta_ms >= 0 and max_age_sec > 0 and delta_ms > max_age_sec * 1000:
             raise ValueError("OTP invalid: WID timestamp is too old")
+    otp = _wotp_code(secret, wid_str, digits)
     if hmac.compare_digest(otp, code):
         print("OTP valid.", flush=True)
         return
@@ -662,10 +1037,62 @@ def _run_wotp_mode(canon: dict[str, str], w_val: int, z_val: int, time_unit: str
     sys.exit(1)
 
 
+# Fast-path shape: only A/W/Z/T keys with literal lowercase values -- no
+# placeholders, aliases, transports or state modes that would need the full
+# normalization pass below.
+_FAST_CANONICAL_RE = re.compile(r"^[AWZT]=[a-z0-9]+$")
+
+
+def _run_canonical_fast(argv: list[str]) -> bool:
+    """Serve plain `A=next`/`A=healthcheck` invocations without the full pass.
+
+    The common interactive call (`A=next W=4 Z=6 T=sec`) needs none of the
+    placeholder normalization, alias table, state-mode split or data-dir
+    mkdir; one scan and a direct emit covers it.
+    """
+    canon = {"W": "4", "Z": "6", "T": "sec"}
+    for item in argv:
+        if not _FAST_CANONICAL_RE.match(item):
+            return False
+        key, value = item.split("=", 1)
+        canon[key] = value
+    action = canon.get("A")
+    if action not in {"next", "healthcheck"}:
+        return False
+    if canon["T"] not in {"sec", "ms"}:
+        return False
+    w_raw, z_raw = canon["W"], canon["Z"]
+    if not w_raw.isdigit() or int(w_raw) <= 0 or not z_raw.isdigit():
+        return False
+    w_val, z_val = int(w_raw), int(z_raw)
+    effective_time_unit = WidCore.TimeUnit.from_string(canon["T"])
+    gen = WidGen(w=w_val, z=z_val, time_unit=effective_time_unit)
+    if action == "next":
+        print(gen.next(), flush=True)
+        return True
+    sample = gen.next()
+    ok = validate_wid(sample, W=w_val, Z=z_val, time_unit=effective_time_unit)
+    payload = {
+        "ok": bool(ok),
+        "kind": "wid",
+        "W": w_val,
+        "Z": z_val,
+        "sample_id": sample,
+        "time_unit": canon["T"],
+    }
+    print(json.dumps(payload, separators=(",", ":")))
+    if not ok:
+        sys.exit(1)
+    return True
+
+
 def _run_canonical(argv: list[str]) -> bool:
     if not argv or not any("=" in item for item in argv):
         return False
 
+    if _run_canonical_fast(argv):
+        return True
+
     canon: dict[str, str] = {
         "A": "run",
         "W": "4",
@@ -682,11 +1109,12 @@ def _run_canonical(argv: list[str]) -> bool:
     l_from_placeholder = False
 
     for item in argv:
-        if "=" not in item:
-            raise ValueError(f"expected KEY=VALUE, got '{item}'")
-        key, value = item.split("=", 1)
-        if key not in CANONICAL_KEYS:
-            raise ValueError(f"unknown key: {key}")
+        m = _CANON_ARG_RE.match(item)
+        if m is None:
+            if "=" not in item:
+                raise ValueError(f"expected KEY=VALUE, got '{item}'")
+            raise ValueError(f"unknown key: {item.split('=', 1)[0]}")
+        key, value = m.group(1), m.group(2)
         canon[key] = value
         if key == "L" and value == "#":
             l_from_placeholder = True
@@ -716,13 +1144,14 @@ def _run_canonical(argv: list[str]) -> bool:
 
     if canon["T"] not in {"sec", "ms"}:
         raise ValueError("T must be sec or ms")
-    if not canon["W"].isdigit() or int(canon["W"]) <= 0:
+    int_match = _CANON_INT_RE.fullmatch
+    if not int_match(canon["W"]) or int(canon["W"]) <= 0:
         raise ValueError("W must be a positive integer")
-    if not canon["Z"].isdigit():
+    if not int_match(canon["Z"]):
         raise ValueError("Z must be a non-negative integer")
-    if not canon["N"].isdigit():
+    if not int_match(canon["N"]):
         raise ValueError("N must be a non-negative integer")
-    if not canon["L"].isdigit():
+    if not int_match(canon["L"]):
         raise ValueError("L must be a non-negative integer (seconds)")
     if canon["R"] not in TRANSPORTS:
         raise ValueError(f"invalid transport: {canon['R']}")
@@ -747,7 +1176,6 @@ def _run_canonical(argv: list[str]) -> bool:
         if d_val
         else (Path.home() / ".local" / "wid" / "services").resolve()
     )
-    data_dir.mkdir(parents=True, exist_ok=True)
 
     effective_time_unit = WidCore.TimeUnit.from_string(time_unit)
 
@@ -764,6 +1192,10 @@ def _run_canonical(argv: list[str]) -> bool:
         if effective_transport == "auto":
             effective_transport = right
 
+    # No branch needs the data directory up front: the sqlite helper creates
+    # parents on first connect, scaffold makes its own tree, and the service
+    # loops only embed the path in payloads.
+
     if action in {"next", "stream", "healthcheck"}:
         if input_src in {"sh", "bash"}:
             root_dir = _repo_root()
@@ -806,22 +1238,39 @@ def _run_canonical(argv: list[str]) -> bool:
 
         gen = WidGen(w=w_val, z=z_val, time_unit=effective_time_unit)
         emitted = 0
+        deadline = time.monotonic()
+        # Hoist the loop invariants: the clamped period, the generator bound
+        # method and the stdout writer are re-resolved per tick otherwise.
+        period = max(0, l_val)
+        sql_mode = state_mode == "sql"
+        sql_path = _sql_state_path(data_dir) if sql_mode else None
+        gen_next = gen.next
+        write = sys.stdout.write
+        flush = sys.stdout.flush
+        # Unpaced sql streams reserve IDs in batches of 64 so the commit (and
+        # its fsync) is amortized; paced streams stay one-per-tick so each
+        # WID is minted at its own tick.
+        pending: list[str] = []
         while n_val == 0 or emitted < n_val:
-            if state_mode == "sql":
-                print(
-                    _sql_allocate_next_wid(
-                        w_val,
-                        z_val,
-                        time_unit,
-                        _sql_state_path(data_dir),
-                    ),
-                    flush=True,
-                )
+            if sql_mode:
+                assert sql_path is not None
+                if period == 0:
+                    if not pending:
+                        batch = 64 if n_val == 0 else min(64, n_val - emitted)
+                        pending = _sql_allocate_next_wid_batch(
+                            w_val, z_val, time_unit, sql_path, batch
+                        )
+                        pending.reverse()
+                    line = pending.pop()
+                else:
+                    line = _sql_allocate_next_wid(w_val, z_val, time_unit, sql_path)
             else:
-                print(gen.next(), flush=True)
+                line = gen_next()
+            write(line + "\n")
+            flush()
             emitted += 1
             if n_val == 0 or emitted < n_val:
-                time.sleep(max(0, l_val))
+                deadline = _sleep_to_deadline(deadline, period)
         return True
 
     if action == "discover":
@@ -901,98 +1350,48 @@ def _run_canonical(argv: list[str]) -> bool:
     log_level = os.environ.get("LOG_LEVEL", "INFO")
     tu: Literal["ms", "sec"] = "ms" if time_unit == "ms" else "sec"
 
-    def _service_emit(payload: dict[str, Any]) -> None:
-        t = payload.get("transport") or payload.get("a_transport", "")
-        if t != "null":
-            print(json.dumps(payload, separators=(",", ":")), flush=True)
-
-    if action == "saf":
-        tick = 0
-        while n_val == 0 or tick < n_val:
-            tick += 1
-            _service_emit({"impl": "python", "action": "saf", "tick": tick,
-                           "transport": effective_transport,
-                           "interval": l_val, "log_level": log_level, "data_dir": str(data_dir)})
-            if n_val == 0 or tick < n_val:
-                time.sleep(max(0, l_val))
-        return True
-
-    if action == "saf-wid":
-        transport = effective_transport if effective_transport != "auto" else "mqtt"
-        if transport not in LOCAL_SERVICE_TRANSPORTS:
-            raise ValueError(f"invalid transport for A=saf-wid: {transport}")
-        gen = WidGen(w=w_val, z=z_val, time_unit=tu)
-        tick = 0
-        while n_val == 0 or tick < n_val:
-            tick += 1
-            _service_emit({"impl": "python", "action": "saf-wid", "tick": tick,
-                           "transport": transport, "wid": gen.next(),
-                           "W": w_val, "Z": z_val, "time_unit": time_unit,
-                           "interval": l_val, "log_level": log_level, "data_dir": str(data_dir)})
-            if n_val == 0 or tick < n_val:
-                time.sleep(max(0, l_val))
-        return True
-
-    if action == "wir":
-        transport = effective_transport if effective_transport != "auto" else "mqtt"
-        if transport not in LOCAL_SERVICE_TRANSPORTS:
-            raise ValueError(f"invalid transport for A=wir: {transport}")
-        tick = 0
-        while n_val == 0 or tick < n_val:
-            tick += 1
-            _service_emit({"impl": "python", "action": "wir", "tick": tick,
-                           "transport": transport, "interval": l_val,
-                           "log_level": log_level, "data_dir": str(data_dir)})
-            if n_val == 0 or tick < n_val:
-                time.sleep(max(0, l_val))
-        return True
-
-    if action == "wism":
-        transport = effective_transport if effective_transport != "auto" else "mqtt"
-        if transport not in LOCAL_SERVICE_TRANSPORTS:
-            raise ValueError(f"invalid transport for A=wism: {transport}")
-        gen = WidGen(w=w_val, z=z_val, time_unit=tu)
-        tick = 0
-        while n_val == 0 or tick < n_val:
-            tick += 1
-            _service_emit({"impl": "python", "action": "wism", "tick": tick,
-                           "transport": transport, "wid": gen.next(),
-                           "W": w_val, "Z": z_val,
-                           "interval": l_val, "data_dir": str(data_dir)})
-            if n_val == 0 or tick < n_val:
-                time.sleep(max(0, l_val))
-        return True
-
-    if action == "wihp":
-        transport = effective_transport if effective_transport != "auto" else "mqtt"
-        if transport not in LOCAL_SERVICE_TRANSPORTS:
-            raise ValueError(f"invalid transport for A=wihp: {transport}")
-        gen = WidGen(w=w_val, z=z_val, time_unit=tu)
-        tick = 0
-        while n_val == 0 or tick < n_val:
-            tick += 1
-            _service_emit({"impl": "python", "action": "wihp", "tick": tick,
-                           "transport": transport, "wid": gen.next(),
-                           "W": w_val, "Z": z_val,
-                           "interval": l_val, "data_dir": str(data_dir)})
-            if n_val == 0 or tick < n_val:
-                time.sleep(max(0, l_val))
+    if action in ("saf", "saf-wid", "wir"):
+        if action == "saf":
+            transport = effective_transport
+        else:
+            transport = effective_transport if effective_transport != "auto" else "mqtt"
+            if transport not in LOCAL_SERVICE_TRANSPORTS:
+                raise ValueError(f"invalid transport for A={action}: {transport}")
+        gen = WidGen(w=w_val, z=z_val, time_unit=tu) if action == "saf-wid" else None
+        # tick/wid placeholders keep the emitted key order stable when the
+        # serialized template is split around them.
+        template: dict[str, Any] = {
+            "impl": "python", "action": action, "tick": 0,
+            "transport": transport,
+        }
+        if action == "saf-wid":
+            template.update({"wid": "", "W": w_val, "Z": z_val, "time_unit": time_unit})
+        template.update(
+            {"interval": l_val, "log_level": log_level, "data_dir": str(data_dir)}
+        )
+        head, mid, tail = _payload_segments(template)
+        _run_spliced_service(
+            head, mid, tail, gen, emit=transport != "null", n_val=n_val, l_val=l_val
+        )
         return True
 
-    if action == "wipr":
+    if action in ("wism", "wihp", "wipr"):
         transport = effective_transport if effective_transport != "auto" else "mqtt"
         if transport not in LOCAL_SERVICE_TRANSPORTS:
-            raise ValueError(f"invalid transport for A=wipr: {transport}")
+            raise ValueError(f"invalid transport for A={action}: {transport}")
         gen = WidGen(w=w_val, z=z_val, time_unit=tu)
-        tick = 0
-        while n_val == 0 or tick < n_val:
-            tick += 1
-            _service_emit({"impl": "python", "action": "wipr", "tick": tick,
-                           "transport": transport, "wid": gen.next(),
-                           "W": w_val, "Z": z_val,
-                           "interval": l_val, "data_dir": str(data_dir)})
-            if n_val == 0 or tick < n_val:
-                time.sleep(max(0, l_val))
+        # tick/wid placeholders keep the emitted key order stable when the
+        # serialized template is split around them.
+        template = {
+            "impl": "python", "action": action, "tick": 0,
+            "transport": transport, "wid": "",
+            "W": w_val, "Z": z_val,
+            "interval": l_val, "data_dir": str(data_dir),
+        }
+        head, mid, tail = _payload_segments(template)
+        _run_spliced_service(
+            head, mid, tail, gen, emit=transport != "null", n_val=n_val, l_val=l_val
+        )
         return True
 
     if action == "duplex":
@@ -1004,45 +1403,92 @@ def _run_canonical(argv: list[str]) -> bool:
             raise ValueError(f"invalid side-A transport: {a_transport}")
         if b_transport not in LOCAL_SERVICE_TRANSPORTS:
             raise ValueError(f"invalid side-B transport: {b_transport}")
-        tick = 0
-        while n_val == 0 or tick < n_val:
-            tick += 1
-            _service_emit({"impl": "python", "action": "duplex", "tick": tick,
-                           "a_transport": a_transport, "b_transport": b_transport,
-                           "interval": l_val, "data_dir": str(data_dir)})
-            if n_val == 0 or tick < n_val:
-                time.sleep(max(0, l_val))
+        template = {
+            "impl": "python", "action": "duplex", "tick": 0,
+            "a_transport": a_transport, "b_transport": b_transport,
+            "interval": l_val, "data_dir": str(data_dir),
+        }
+        head, mid, tail = _payload_segments(template)
+        _run_spliced_service(
+            head, mid, tail, None, emit=a_transport != "null", n_val=n_val, l_val=l_val
+        )
         return True
 
     raise ValueError(f"unknown A={action}")
 
 
+def _payload_segments(base: dict[str, Any]) -> tuple[str, str | None, str]:
+    """Split a serialized payload template around its tick/wid placeholders.
+
+    The template carries `"tick": 0` (and `"wid": ""` when the action emits
+    ids); serializing it once and cutting at those placeholders leaves three
+    constant JSON fragments, so the emit loop never sees a dict or the json
+    encoder again.
+    """
+    dumped = json.dumps(base, separators=(",", ":"))
+    head, _, rest = dumped.partition('"tick":0')
+    head += '"tick":'
+    if '"wid":""' not in rest:
+        return head, None, rest
+    mid, _, tail = rest.partition('"wid":""')
+    return head, mid + '"wid":"', '"' + tail
+
+
+def _run_spliced_service(
+    head: str,
+    mid: str | None,
+    tail: str,
+    gen: WidGen | None,
+    *,
+    emit: bool,
+    n_val: int,
+    l_val: float,
+) -> None:
+    """The single emit loop behind every local service action."""
+    write = sys.stdout.write
+    flush = sys.stdout.flush
+    period = max(0, l_val)
+    tick = 0
+    deadline = time.monotonic()
+    while n_val == 0 or tick < n_val:
+        tick += 1
+        if emit:
+            if gen is not None:
+                write(f"{head}{tick}{mid}{gen.next()}{tail}\n")
+            else:
+                write(f"{head}{tick}{tail}\n")
+            flush()
+        if n_val == 0 or tick < n_val:
+            deadline = _sleep_to_deadline(deadline, period)
+
+
+# Flag name -> (result slot, converter); one dict probe per argument instead
+# of walking an elif chain of string comparisons.
+_VALIDATE_FLAG_SLOTS: dict[str, tuple[str, Callable[[str], Any]]] = {
+    "--kind": ("kind", str),
+    "--W": ("w", int),
+    "--Z": ("z", int),
+    "--time-unit": ("time_unit", str),
+    "--T": ("time_unit", str),
+}
+
+
 def _parse_validate_flags(args: list[str]) -> tuple[str, int, int, str]:
     """Parse --kind --W --Z --time-unit flags; return (kind, W, Z, time_unit)."""
-    kind = "wid"
-    w = 4
-    z = 6
-    time_unit = "sec"
+    values: dict[str, Any] = {"kind": "wid", "w": 4, "z": 6, "time_unit": "sec"}
     i = 0
-    while i < len(args):
-        arg = args[i]
-        if arg == "--kind" and i + 1 < len(args):
-            kind = args[i + 1]
-            if kind not in ("wid", "hlc"):
-                raise ValueError("--kind must be one of: wid, hlc")
-            i += 2
-        elif arg == "--W" and i + 1 < len(args):
-            w = int(args[i + 1])
-            i += 2
-        elif arg == "--Z" and i + 1 < len(args):
-            z = int(args[i + 1])
-            i += 2
-        elif arg in ("--time-unit", "--T") and i + 1 < len(args):
-            time_unit = args[i + 1]
+    last = len(args) - 1
+    while i <= last:
+        slot = _VALIDATE_FLAG_SLOTS.get(args[i])
+        if slot is not None and i < last:
+            key, convert = slot
+            values[key] = convert(args[i + 1])
             i += 2
         else:
             i += 1
-    return kind, w, z, time_unit
+    if values["kind"] not in ("wid", "hlc"):
+        raise ValueError("--kind must be one of: wid, hlc")
+    return values["kind"], values["w"], values["z"], values["time_unit"]
 
 
 def _run_validate_mode(args: list[str]) -> None:
@@ -1180,6 +1626,18 @@ complete -c wid -f -a 'L=' -d 'Interval seconds'""")
         sys.exit(1)
 
 
+# Subcommand -> handler; one dict probe in main() instead of an equality
+# ladder, which short-lived invocations pay on every run.
+_COMMAND_HANDLERS: dict[str, Callable[[list[str]], None]] = {
+    "next": lambda args: _run_emit_mode("next", args),
+    "stream": lambda args: _run_emit_mode("stream", args),
+    "help-actions": lambda _args: _print_actions(),
+    "healthcheck": _run_healthcheck_mode,
+    "validate": _run_validate_mode,
+    "parse": _run_parse_mode,
+}
+
+
 def main() -> None:
     """Wid main entrypoint."""
     if len(sys.argv) >= 2 and sys.argv[1] == "__daemon":
@@ -1229,24 +1687,9 @@ def main() -> None:
             return
 
     cmd = sys.argv[1]
-    if cmd in {"next", "stream"}:
-        _run_emit_mode(cmd, sys.argv[2:])
-        return
-
-    if cmd == "help-actions":
-        _print_actions()
-        return
-
-    if cmd == "healthcheck":
-        _run_healthcheck_mode(sys.argv[2:])
-        return
-
-    if cmd == "validate":
-        _run_validate_mode(sys.argv[2:])
-        return
-
-    if cmd == "parse":
-        _run_parse_mode(sys.argv[2:])
+    handler = _COMMAND_HANDLERS.get(cmd)
+    if handler is not None:
+        handler(sys.argv[2:])
         return
 
     print(f"Unknown command: {cmd}", file=sys.stderr)
@@ -1254,18 +1697,20 @@ def main() -> None:
 
 
 def _run_canonical_entry(action: str) -> None:
-    original = list(sys.argv)
+    # Keep the original list object and rebind sys.argv to a new one; the
+    # original is only read, so no defensive copy is needed to restore it.
+    original = sys.argv
     try:
-        sys.argv = [sys.argv[0], f"A={action}", *original[1:]]
+        sys.argv = [original[0], f"A={action}", *original[1:]]
         main()
     finally:
         sys.argv = original
 
 
 def _run_cli_entry(args: list[str]) -> None:
-    original = list(sys.argv)
+    original = sys.argv
     try:
-        sys.argv = [sys.argv[0], *args, *original[1:]]
+        sys.argv = [original[0], *args, *original[1:]]
         main()
     finally:
         sys.argv = original
@@ -7,11 +7,26 @@ from __future__ import annotations
 
 import os
 import time
+from collections.abc import Callable
 from dataclasses import dataclass
-from datetime import datetime, timezone
 from typing import Any, Literal, final
 
-from .parse import MAX_W, MAX_Z
+from .parse import MAX_W, MAX_Z, _NODE_RE
+
+
+def _civil_from_days(days: int) -> tuple[int, int, int]:
+    # Days since the Unix epoch -> (year, month, day), via Howard Hinnant's
+    # civil_from_days: pure integer math, no datetime/tzinfo allocation.
+    # 719468 shifts the epoch to 0000-03-01 so leap days land at year end.
+    z = days + 719468
+    era, doe = divmod(z, 146097)
+    yoe = (doe - doe // 1460 + doe // 36524 - doe // 146096) // 365
+    doy = doe - (365 * yoe + yoe // 4 - yoe // 100)
+    mp = (5 * doy + 2) // 153
+    day = doy - (153 * mp + 2) // 5 + 1
+    month = mp + 3 if mp < 10 else mp - 9
+    year = yoe + era * 400 + (month <= 2)
+    return year, month, day
 
 
 @dataclass(frozen=True, slots=True)
@@ -42,6 +57,11 @@ class HLCWidGen:
     lc: int
     _cached_sec: int
     _cached_ts: str
+    _rand_buf: bytes
+    _rand_off: int
+    _now: Callable[[], int]
+    _lc_fmt: Callable[[int], str]
+    _node_suffix: str
 
     def __init__(
         self,
@@ -58,7 +78,9 @@ class HLCWidGen:
         if "z" in kwargs:
             Z = int(kwargs.pop("z"))  # pyright: ignore[reportConstantRedefinition]
 
-        if not node or any(c.isspace() for c in node) or "-" in node:
+        # _NODE_RE (shared with the parser) rejects empty/whitespace tokens
+        # in one C-level match instead of a per-character comprehension.
+        if "-" in node or not _NODE_RE.match(node):
             raise ValueError("node must be a non-empty token (no whitespace or '-')")
         # Bounds match all six implementations: W > 18 would overflow an
         # int64 logical counter; Z > 64 exceeds the C implementation's WID_MAX_Z.
@@ -78,28 +100,54 @@ class HLCWidGen:
         self.pt = 0
         self.lc = 0
 
+        # Bound format method: one allocation per counter render, vs the
+        # str()+zfill() intermediate pair.
+        self._lc_fmt = f"{{:0{W}d}}".format
+        # The "Z-<node>" fragment never changes; build it once.
+        self._node_suffix = f"Z-{node}"
+
         self._cached_sec = -1
         self._cached_ts = ""
+        self._rand_buf = b""
+        self._rand_off = 0
+
+        # Clock read bound once: time.time_ns() hands back an integer, so
+        # the hot path skips both the float round-trip of time.time() and
+        # the per-call time_unit branch.
+        if time_unit == "ms":
+            self._now = lambda: time.time_ns() // 1_000_000
+        else:
+            self._now = lambda: time.time_ns() // 1_000_000_000
 
     def _ts_for_sec(self, sec: int) -> str:
+        # Cache misses happen once per (milli)second per generator; divmods
+        # plus zero-padded f-strings beat datetime.fromtimestamp + strftime
+        # by a wide margin and allocate no intermediate objects.
         if sec != self._cached_sec:
             self._cached_sec = sec
             if self.time_unit == "ms":
-                sec_part = sec // 1000
-                ms_part = sec % 1000
-                base = datetime.fromtimestamp(sec_part, tz=timezone.utc).strftime(
-                    "%Y%m%dT%H%M%S"
-                )
-                self._cached_ts = f"{base}{ms_part:03d}"
+                sec_part, ms_part = divmod(sec, 1000)
             else:
-                self._cached_ts = datetime.fromtimestamp(sec, tz=timezone.utc).strftime(
-                    "%Y%m%dT%H%M%S"
-                )
+                sec_part, ms_part = sec, -1
+            days, rem = divmod(sec_part, 86400)
+            hh, rem = divmod(rem, 3600)
+            mm, ss = divmod(rem, 60)
+            y, mo, d = _civil_from_days(days)
+            base = f"{y:04d}{mo:02d}{d:02d}T{hh:02d}{mm:02d}{ss:02d}"
+            self._cached_ts = f"{base}{ms_part:03d}" if ms_part >= 0 else base
         return self._cached_ts
 
-    @staticmethod
-    def _pad_hex(z: int) -> str:
-        return os.urandom((z + 1) // 2).hex()[:z]
+    def _pad_hex(self, z: int) -> str:
+        # Buffered entropy: refill 4 KiB from os.urandom when drained and
+        # slice per id, so padding costs one getrandom syscall per ~hundreds
+        # of ids instead of one each.
+        nbytes = (z + 1) // 2
+        off = self._rand_off
+        if off + nbytes > len(self._rand_buf):
+            self._rand_buf = os.urandom(4096)
+            off = 0
+        self._rand_off = off + nbytes
+        return self._rand_buf[off : off + nbytes].hex()[:z]
 
     def _rollover_if_needed(self) -> None:
         if self.lc > self.max_lc:
@@ -111,7 +159,7 @@ class HLCWidGen:
         if remote_pt < 0 or remote_lc < 0:
             raise ValueError("remote values must be non-negative")
 
-        now = int(time.time() * 1000) if self.time_unit == "ms" else int(time.time())
+        now = self._now()
         new_pt = max(now, self.pt, remote_pt)
 
         if new_pt == self.pt == remote_pt:
@@ -128,29 +176,74 @@ class HLCWidGen:
 
     def next(self) -> str:
         """Get the next id."""
-        now = int(time.time() * 1000) if self.time_unit == "ms" else int(time.time())
-
-        if now > self.pt:
-            self.pt = now
-            self.lc = 0
+        now = self._now()
+
+        # Tick kernel on locals: one attribute load per field and a single
+        # write-back, instead of interleaving self.* loads and stores with
+        # the branchy counter update.
+        pt = self.pt
+        lc = self.lc
+        if now > pt:
+            pt = now
+            lc = 0
         else:
-            self.lc += 1
-
-        self._rollover_if_needed()
+            lc += 1
+            if lc > self.max_lc:
+                pt += 1
+                lc = 0
+        self.pt = pt
+        self.lc = lc
 
-        ts = self._ts_for_sec(self.pt)
-        lc_str = str(self.lc).zfill(self.w)
+        ts = self._ts_for_sec(pt)
+        lc_str = self._lc_fmt(lc)
 
         if self.z > 0:
             pad = self._pad_hex(self.z)
-            return f"{ts}.{lc_str}Z-{self.node}-{pad}"
-        return f"{ts}.{lc_str}Z-{self.node}"
+            return f"{ts}.{lc_str}{self._node_suffix}-{pad}"
+        return f"{ts}.{lc_str}{self._node_suffix}"
 
     def next_n(self, n: int) -> list[str]:
         """Get next n ids."""
         if n < 0:
             raise ValueError("n must be >= 0")
-        return [self.next() for _ in range(n)]
+        if n == 0:
+            return []
+        # First id goes through next() so the clock read and rollover stay
+        # in one place. The rest is emitted in same-tick runs that share the
+        # cached timestamp: the invariant "<ts>." and "Z-<node>" fragments
+        # and the zero-pad format are built once per run, and for Z > 0 the
+        # run's padding entropy comes from a single os.urandom call sliced
+        # per id instead of one syscall each.
+        out = [self.next()]
+        remaining = n - 1
+        z = self.z
+        pad_bytes = (z + 1) // 2
+        fmt = self._lc_fmt
+        while remaining > 0:
+            run = min(remaining, self.max_lc - self.lc)
+            if run <= 0:
+                # counter exhausted for this tick; next() rolls over
+                out.append(self.next())
+                remaining -= 1
+                continue
+            ts_prefix = self._ts_for_sec(self.pt) + "."
+            node_suffix = self._node_suffix
+            start = self.lc + 1
+            if z > 0:
+                entropy = os.urandom(pad_bytes * run)
+                out.extend(
+                    f"{ts_prefix}{fmt(lc)}{node_suffix}-"
+                    f"{entropy[i * pad_bytes : (i + 1) * pad_bytes].hex()[:z]}"
+                    for i, lc in enumerate(range(start, start + run))
+                )
+            else:
+                out.extend(
+                    f"{ts_prefix}{fmt(lc)}{node_suffix}"
+                    for lc in range(start, start + run)
+                )
+            self.lc = start + run - 1
+            remaining -= run
+        return out
 
     def state(self) -> HLCState:
         """Get the generator state."""
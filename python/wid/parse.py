@@ -5,17 +5,21 @@
 
 from __future__ import annotations
 
+import functools
 import re
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from typing import Literal
 
-_HEX_LOWER_RE_CACHE: dict[int, re.Pattern[str]] = {}
-_WID_BASE_RE_CACHE: dict[tuple[int, str], re.Pattern[str]] = {}
-_HLC_BASE_RE_CACHE: dict[tuple[int, str], re.Pattern[str]] = {}
-
 _NODE_RE = re.compile(r"^\S+\Z")  # no whitespace; \Z (not $) rejects a trailing newline
 
+_HEX_LOWER = frozenset("0123456789abcdef")
+
+# Hoisted singletons: one global load per parse instead of a module attribute
+# chain, which adds up over bulk validate/parse loops.
+_UTC = timezone.utc
+_DT = datetime
+
 # Maximum sequence/logical-counter width: 10^18 - 1 is the largest all-nines
 # value that fits in an int64 (10^19 overflows), so W > 18 cannot be
 # represented by the i64-based implementations and is rejected uniformly
@@ -45,59 +49,36 @@ class ParsedHlcWid:
     padding: str | None
 
 
-def _hex_re(z: int) -> re.Pattern[str]:
-    p = _HEX_LOWER_RE_CACHE.get(z)
-    if p is None:
-        p = re.compile(rf"^[0-9a-f]{{{z}}}\Z")
-        _HEX_LOWER_RE_CACHE[z] = p
-    return p
-
-
-def _wid_base_re(W: int, time_unit: Literal["sec", "ms"]) -> re.Pattern[str]:
-    # Captures: date(8), time(6|9), seq(W), suffix (optional)
-    key = (W, time_unit)
-    p = _WID_BASE_RE_CACHE.get(key)
-    if p is None:
-        time_digits = 9 if time_unit == "ms" else 6
-        # Use [0-9] not \d (\d matches Unicode decimal digits, which int() then
-        # happily parses) and \Z not $ (a bare $ matches before a trailing
-        # newline). Both would let this impl accept WIDs the other five reject.
-        p = re.compile(
-            rf"^([0-9]{{8}})T([0-9]{{{time_digits}}})\.([0-9]{{{W}}})Z(.*)?\Z"
-        )
-        _WID_BASE_RE_CACHE[key] = p
-    return p
-
-
-def _hlc_base_re(W: int, time_unit: Literal["sec", "ms"]) -> re.Pattern[str]:
-    # Captures: date(8), time(6|9), lc(W), node, suffix (optional)
-    key = (W, time_unit)
-    p = _HLC_BASE_RE_CACHE.get(key)
-    if p is None:
-        time_digits = 9 if time_unit == "ms" else 6
-        # [0-9]/\Z rather than \d/$ for the same reasons as _wid_base_re.
-        p = re.compile(
-            rf"^([0-9]{{8}})T([0-9]{{{time_digits}}})\.([0-9]{{{W}}})Z-([^\s-]+)(.*)?\Z"
-        )
-        _HLC_BASE_RE_CACHE[key] = p
-    return p
+def _is_ascii_digits(s: str) -> bool:
+    # isdigit() alone accepts Unicode decimal digits, which int() would then
+    # happily parse; the isascii() guard keeps this as strict as the [0-9]
+    # classes the other five implementations use.
+    return s.isascii() and s.isdigit()
+
+
+def _is_hex_lower(seg: str, z: int) -> bool:
+    if len(seg) != z:
+        return False
+    # Set-subset check runs in C over the whole segment; for the short hex
+    # suffixes here it beats both a regex match and a per-character genexpr.
+    return set(seg) <= _HEX_LOWER
 
 
 def _parse_ts(
     date_str: str, time_str: str, time_unit: Literal["sec", "ms"] = "sec"
 ) -> datetime | None:
     try:
-        year = int(date_str[0:4])
-        month = int(date_str[4:6])
-        day = int(date_str[6:8])
-        hour = int(time_str[0:2])
-        minute = int(time_str[2:4])
-        second = int(time_str[4:6])
+        # Two int() parses + divmod cascades instead of six sliced int()
+        # calls; the fields are pre-validated ASCII digits.
+        year, md = divmod(int(date_str), 10000)
+        month, day = divmod(md, 100)
+        hour, ms_ = divmod(int(time_str[:6]), 10000)
+        minute, second = divmod(ms_, 100)
         millis = int(time_str[6:9]) if time_unit == "ms" else 0
         if millis < 0 or millis > 999:
             return None
         # strict: datetime will raise for invalid calendar values
-        return datetime(
+        return _DT(
             year,
             month,
             day,
@@ -105,7 +86,7 @@ def _parse_ts(
             minute,
             second,
             millis * 1000,
-            tzinfo=timezone.utc,
+            tzinfo=_UTC,
         )
     except ValueError:
         return None
@@ -119,23 +100,29 @@ def validate_wid(
 
 
 # pylint: disable=too-many-return-statements
-def parse_wid(
-    wid: str, W: int = 4, Z: int = 6, time_unit: Literal["sec", "ms"] = "sec"
+@functools.lru_cache(maxsize=4096)
+def _parse_wid_cached(
+    wid: str, W: int, Z: int, time_unit: Literal["sec", "ms"]
 ) -> ParsedWid | None:
-    """Try to parse a possible wid."""
-    if W <= 0 or W > MAX_W or Z < 0 or Z > MAX_Z or time_unit not in {"sec", "ms"}:
+    # The layout is entirely positional (8 date digits, 'T', 6|9 time digits,
+    # '.', W sequence digits, 'Z', optional suffix), so a slice-based scan is
+    # several times cheaper than the regex engine plus group extraction.
+    tlen = 9 if time_unit == "ms" else 6
+    zpos = 10 + tlen + W
+    if len(wid) <= zpos:
         return None
-
-    m = _wid_base_re(W, time_unit).match(wid)
-    if not m:
+    if wid[8] != "T" or wid[9 + tlen] != "." or wid[zpos] != "Z":
         return None
-
-    date_str, time_str, seq_str, suffix = (
-        m.group(1),
-        m.group(2),
-        m.group(3),
-        m.group(4) or "",
-    )
+    date_str = wid[0:8]
+    time_str = wid[9 : 9 + tlen]
+    seq_str = wid[10 + tlen : zpos]
+    if (
+        not _is_ascii_digits(date_str)
+        or not _is_ascii_digits(time_str)
+        or not _is_ascii_digits(seq_str)
+    ):
+        return None
+    suffix = wid[zpos + 1 :]
     ts = _parse_ts(date_str, time_str, time_unit)
     if ts is None:
         return None
@@ -150,7 +137,7 @@ def parse_wid(
         if Z == 0:
             # no suffix allowed when Z==0 for WID
             return None
-        if not _hex_re(Z).match(seg):
+        if not _is_hex_lower(seg, Z):
             return None
         padding = seg
     else:
@@ -161,6 +148,19 @@ def parse_wid(
     return ParsedWid(raw=wid, timestamp=ts, sequence=seq, padding=padding)
 
 
+def parse_wid(
+    wid: str, W: int = 4, Z: int = 6, time_unit: Literal["sec", "ms"] = "sec"
+) -> ParsedWid | None:
+    """Try to parse a possible wid."""
+    # Results are memoized per (wid, W, Z, time_unit): validate/parse loops
+    # over repeated ids become dict lookups, and the frozen dataclasses make
+    # sharing one instance across callers safe. Argument validation stays out
+    # here so rejected parameter combinations never occupy cache slots.
+    if W <= 0 or W > MAX_W or Z < 0 or Z > MAX_Z or time_unit not in {"sec", "ms"}:
+        return None
+    return _parse_wid_cached(wid, W, Z, time_unit)
+
+
 def validate_hlc_wid(
     wid: str, W: int = 4, Z: int = 0, time_unit: Literal["sec", "ms"] = "sec"
 ) -> bool:
@@ -168,24 +168,40 @@ def validate_hlc_wid(
     return parse_hlc_wid(wid, W=W, Z=Z, time_unit=time_unit) is not None
 
 
-def parse_hlc_wid(
-    wid: str, W: int = 4, Z: int = 0, time_unit: Literal["sec", "ms"] = "sec"
+@functools.lru_cache(maxsize=4096)
+def _parse_hlc_wid_cached(
+    wid: str, W: int, Z: int, time_unit: Literal["sec", "ms"]
 ) -> ParsedHlcWid | None:
-    """Parse an HLC WID."""
-    if W <= 0 or W > MAX_W or Z < 0 or Z > MAX_Z or time_unit not in {"sec", "ms"}:
+    # Same positional scan as parse_wid, with '-<node>' between the 'Z' and
+    # any padding suffix. The node is the maximal run of characters that are
+    # neither '-' nor whitespace, matching the old [^\s-]+ capture.
+    tlen = 9 if time_unit == "ms" else 6
+    zpos = 10 + tlen + W
+    if len(wid) <= zpos + 2:
         return None
-
-    m = _hlc_base_re(W, time_unit).match(wid)
-    if not m:
+    if wid[8] != "T" or wid[9 + tlen] != "." or wid[zpos] != "Z":
         return None
-
-    date_str, time_str, lc_str, node, suffix = (
-        m.group(1),
-        m.group(2),
-        m.group(3),
-        m.group(4),
-        m.group(5) or "",
-    )
+    if wid[zpos + 1] != "-":
+        return None
+    date_str = wid[0:8]
+    time_str = wid[9 : 9 + tlen]
+    lc_str = wid[10 + tlen : zpos]
+    if (
+        not _is_ascii_digits(date_str)
+        or not _is_ascii_digits(time_str)
+        or not _is_ascii_digits(lc_str)
+    ):
+        return None
+    rest = wid[zpos + 2 :]
+    end = len(rest)
+    for i, ch in enumerate(rest):
+        if ch == "-" or ch.isspace():
+            end = i
+            break
+    if end == 0:
+        return None
+    node = rest[:end]
+    suffix = rest[end:]
     if not _NODE_RE.match(node):
         return None
 
@@ -202,10 +218,25 @@ def parse_hlc_wid(
         seg = suffix[1:]
         if Z == 0:
             return None
-        if not _hex_re(Z).match(seg):
+        if not _is_hex_lower(seg, Z):
             return None
         padding = seg
 
     return ParsedHlcWid(
         raw=wid, timestamp=ts, logical_counter=lc, node=node, padding=padding
     )
+
+
+def parse_hlc_wid(
+    wid: str, W: int = 4, Z: int = 0, time_unit: Literal["sec", "ms"] = "sec"
+) -> ParsedHlcWid | None:
+    """Parse an HLC WID."""
+    if W <= 0 or W > MAX_W or Z < 0 or Z > MAX_Z or time_unit not in {"sec", "ms"}:
+        return None
+    return _parse_hlc_wid_cached(wid, W, Z, time_unit)
+
+
+def clear_parse_caches() -> None:
+    """Drop memoized parse results (test hygiene / long-lived processes)."""
+    _parse_wid_cached.cache_clear()
+    _parse_hlc_wid_cached.cache_clear()
@@ -10,13 +10,31 @@ from __future__ import annotations
 import os
 import sqlite3
 import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
 from dataclasses import dataclass
-from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Literal, final
 
+from .hlc import _civil_from_days
 from .parse import MAX_W, MAX_Z
 
+# Statement texts live at module scope so every store instance hands sqlite3
+# the identical string object, keeping the connection's prepared-statement
+# cache hot across calls.
+_SQL_STORE_CREATE = (
+    "CREATE TABLE IF NOT EXISTS wid_state ("
+    "k TEXT PRIMARY KEY, "
+    "last_tick INTEGER NOT NULL, "
+    "last_seq INTEGER NOT NULL)"
+)
+_SQL_STORE_SELECT = "SELECT last_tick, last_seq FROM wid_state WHERE k = ?"
+_SQL_STORE_UPSERT = (
+    "INSERT INTO wid_state(k, last_tick, last_seq) VALUES(?, ?, ?) "
+    "ON CONFLICT(k) DO UPDATE SET "
+    "last_tick=excluded.last_tick, last_seq=excluded.last_seq"
+)
+
 
 @dataclass(frozen=True, slots=True)
 class WidGenState:
@@ -37,6 +55,10 @@ class WidStateStore:
         """Save state for key."""
         raise NotImplementedError
 
+    def save_batch(self, key: str, state: WidGenState) -> None:
+        """Persist the final state of a batch; defaults to a single save."""
+        self.save(key, state)
+
 
 @final
 class MemoryWidStateStore(WidStateStore):
@@ -48,43 +70,52 @@ class MemoryWidStateStore(WidStateStore):
 
     def load(self, key: str) -> WidGenState | None:
         """Load state for key."""
-        state = self._state.get(key)
-        if state is None:
-            return None
-        return WidGenState(last_sec=state.last_sec, last_seq=state.last_seq)
+        # WidGenState is frozen: aliasing the stored instance is safe, so
+        # no defensive copy is needed in either direction.
+        return self._state.get(key)
 
     def save(self, key: str, state: WidGenState) -> None:
         """Save state for key."""
-        self._state[key] = WidGenState(last_sec=state.last_sec, last_seq=state.last_seq)
+        self._state[key] = state
 
 
 @final
 class SqliteWidStateStore(WidStateStore):
     """SQLite-backed Wid state store."""
 
-    def __init__(self, database_path: str, prefix: str = "wid") -> None:
+    _JOURNAL_MODES = frozenset({"WAL", "DELETE", "TRUNCATE", "PERSIST", "MEMORY"})
+
+    def __init__(
+        self, database_path: str, prefix: str = "wid", journal_mode: str = "WAL"
+    ) -> None:
         """Initialize SQLite store."""
+        if journal_mode.upper() not in self._JOURNAL_MODES:
+            raise ValueError(f"invalid journal_mode: {journal_mode}")
         db_file = Path(database_path)
         db_file.parent.mkdir(parents=True, exist_ok=True)
         self._conn = sqlite3.connect(str(db_file))
+        # WAL lets readers run alongside the writer and, with
+        # synchronous=NORMAL, drops to one fsync per checkpoint instead of
+        # two per commit; tests can pass journal_mode="DELETE" to keep the
+        # rollback-journal behavior.
+        self._conn.execute(f"PRAGMA journal_mode={journal_mode.upper()}")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA temp_store=MEMORY")
+        self._conn.execute("PRAGMA mmap_size=134217728")
+        self._conn.execute("PRAGMA cache_size=-8000")
         self._prefix = prefix
-        q = (
-            "CREATE TABLE IF NOT EXISTS wid_state ("
-            "k TEXT PRIMARY KEY, "
-            "last_tick INTEGER NOT NULL, "
-            "last_seq INTEGER NOT NULL)"
-        )
-        self._conn.execute(q)
+        self._key_prefix = prefix + ":"
+        # One long-lived cursor: sqlite3 keys its statement cache per
+        # connection, but reusing the cursor also skips a cursor allocation
+        # per load/save.
+        self._cursor = self._conn.cursor()
+        self._cursor.execute(_SQL_STORE_CREATE)
         self._conn.commit()
 
-    def _full_key(self, key: str) -> str:
-        return f"{self._prefix}:{key}"
-
     def load(self, key: str) -> WidGenState | None:
         """Load state for key."""
-        row = self._conn.execute(
-            "SELECT last_tick, last_seq FROM wid_state WHERE k = ?",
-            (self._full_key(key),),
+        row = self._cursor.execute(
+            _SQL_STORE_SELECT, (self._key_prefix + key,)
         ).fetchone()
         if row is None:
             return None
@@ -94,17 +125,30 @@ class SqliteWidStateStore(WidStateStore):
 
     def save(self, key: str, state: WidGenState) -> None:
         """Save state for key."""
-        q_s = (
-            "INSERT INTO wid_state(k, last_tick, last_seq) VALUES(?, ?, ?) "
-            "ON CONFLICT(k) DO UPDATE SET "
-            "last_tick=excluded.last_tick, last_seq=excluded.last_seq"
+        self._cursor.execute(
+            _SQL_STORE_UPSERT, (self._key_prefix + key, state.last_sec, state.last_seq)
         )
-        q_p = (self._full_key(key), state.last_sec, state.last_seq)
-        self._conn.execute(q_s, q_p)
+        self._conn.commit()
+
+    def save_batch(self, key: str, state: WidGenState) -> None:
+        """Persist the final state of a batch in one explicit transaction."""
+        self._cursor.execute("BEGIN IMMEDIATE")
+        try:
+            self._cursor.execute(
+                _SQL_STORE_UPSERT,
+                (self._key_prefix + key, state.last_sec, state.last_seq),
+            )
+        except BaseException:
+            self._conn.rollback()
+            raise
         self._conn.commit()
 
     def close(self) -> None:
         """Close SQLite connection."""
+        try:
+            self._conn.execute("PRAGMA optimize")
+        except sqlite3.Error:  # pragma: no cover
+            pass
         self._conn.close()
 
 
@@ -126,9 +170,11 @@ class WidGen:
     last_seq: int
     _cached_sec: int
     _cached_ts: str
+    _cached_ts_dot: str
     _state_store: WidStateStore | None
     _state_key: str
     _auto_persist: bool
+    _now: Callable[[], int]
 
     # pylint: disable=too-many-arguments,too-many-positional-arguments
     def __init__(
@@ -174,6 +220,20 @@ class WidGen:
 
         self._cached_sec = -1
         self._cached_ts = ""
+        self._cached_ts_dot = ""
+        self._rand_pool = b""
+        self._rand_pos = 0
+
+        # Clock read bound once: time.time_ns() hands back an integer, so
+        # the hot path skips both the float round-trip of time.time() and
+        # the per-call time_unit branch.
+        if time_unit == "ms":
+            self._now = lambda: time.time_ns() // 1_000_000
+        else:
+            self._now = lambda: time.time_ns() // 1_000_000_000
+        # Bound format method: one allocation per sequence render, vs the
+        # str()+zfill() intermediate pair.
+        self._seq_fmt = f"{{:0{W}d}}".format
 
         if self._auto_persist and self._state_store is not None:
             loaded = self._state_store.load(self._state_key)
@@ -191,31 +251,38 @@ class WidGen:
             return
 
     def _ts_for_sec(self, sec: int) -> str:
+        # Same integer formatting as HLCWidGen: divmods plus civil_from_days
+        # instead of datetime.fromtimestamp + strftime, so cache misses (one
+        # per tick, i.e. per millisecond in ms mode) allocate no datetime.
         if sec != self._cached_sec:
             self._cached_sec = sec
             if self.time_unit == "ms":
-                sec_part = sec // 1000
-                ms_part = sec % 1000
-                base = datetime.fromtimestamp(sec_part, tz=timezone.utc).strftime(
-                    "%Y%m%dT%H%M%S"
-                )
-                self._cached_ts = f"{base}{ms_part:03d}"
+                sec_part, ms_part = divmod(sec, 1000)
             else:
-                self._cached_ts = datetime.fromtimestamp(sec, tz=timezone.utc).strftime(
-                    "%Y%m%dT%H%M%S"
-                )
+                sec_part, ms_part = sec, -1
+            days, rem = divmod(sec_part, 86400)
+            hh, rem = divmod(rem, 3600)
+            mm, ss = divmod(rem, 60)
+            y, mo, d = _civil_from_days(days)
+            base = f"{y:04d}{mo:02d}{d:02d}T{hh:02d}{mm:02d}{ss:02d}"
+            self._cached_ts = f"{base}{ms_part:03d}" if ms_part >= 0 else base
+            self._cached_ts_dot = self._cached_ts + "."
         return self._cached_ts
 
-    @staticmethod
-    def _pad_hex(z: int) -> str:
-        # Z hex chars => ceil(Z/2) bytes
-        return os.urandom((z + 1) // 2).hex()[:z]
+    def _pad_hex(self, z: int) -> str:
+        # Z hex chars => ceil(Z/2) bytes, sliced from a buffered urandom
+        # pool so padding costs one getrandom syscall per ~hundreds of ids.
+        half = (z + 1) // 2
+        pos = self._rand_pos
+        if pos + half > len(self._rand_pool):
+            self._rand_pool = os.urandom(4096)
+            pos = 0
+        self._rand_pos = pos + half
+        return self._rand_pool[pos : pos + half].hex()[:z]
 
     def next(self) -> str:
         """Get the next id."""
-        now_sec = (
-            int(time.time() * 1000) if self.time_unit == "ms" else int(time.time())
-        )
+        now_sec = self._now()
         sec = now_sec if now_sec > self.last_sec else self.last_sec
 
         seq = (self.last_seq + 1) if (sec == self.last_sec) else 0
@@ -226,18 +293,87 @@ class WidGen:
         self.last_sec, self.last_seq = sec, seq
         self._persist_state()
 
-        ts = self._ts_for_sec(sec)
-        seq_str = str(seq).zfill(self.W)
-
+        # _ts_for_sec keeps the "<ts>." prefix cached in lockstep, so the
+        # common same-tick call is prefix + formatted seq + tail.
+        self._ts_for_sec(sec)
         if self.Z > 0:
-            return f"{ts}.{seq_str}Z-{self._pad_hex(self.Z)}"
-        return f"{ts}.{seq_str}Z"
+            return f"{self._cached_ts_dot}{self._seq_fmt(seq)}Z-{self._pad_hex(self.Z)}"
+        return f"{self._cached_ts_dot}{self._seq_fmt(seq)}Z"
 
     def next_n(self, n: int) -> list[str]:
-        """Get the next number."""
+        """Get the next n ids."""
         if n < 0:
             raise ValueError("n must be >= 0")
-        return [self.next() for _ in range(n)]
+        if n == 0:
+            return []
+        # First id goes through next() so the clock read, rollover and
+        # persistence logic stay in one place. The rest of the batch is
+        # emitted in same-second runs: every id in a run shares the cached
+        # timestamp string, so the tight loop below only formats the
+        # sequence (and padding), skipping the per-call clock read and
+        # state bookkeeping of next().
+        # Persistence is deferred for the whole batch: one transaction for
+        # the final state instead of a commit per id or per run.
+        persist = self._auto_persist
+        self._auto_persist = False
+        try:
+            out = [self.next()]
+            remaining = n - 1
+            Z = self.Z
+            pad_bytes = (Z + 1) // 2
+            fmt = self._seq_fmt
+            while remaining > 0:
+                run = min(remaining, self.max_seq - self.last_seq)
+                if run <= 0:
+                    # sequence exhausted for this second; next() rolls over
+                    out.append(self.next())
+                    remaining -= 1
+                    continue
+                self._ts_for_sec(self.last_sec)
+                ts_dot = self._cached_ts_dot
+                start = self.last_seq + 1
+                if Z > 0:
+                    # One urandom call per run, sliced per id.
+                    entropy = os.urandom(pad_bytes * run)
+                    out.extend(
+                        f"{ts_dot}{fmt(seq)}Z-"
+                        f"{entropy[i * pad_bytes : (i + 1) * pad_bytes].hex()[:Z]}"
+                        for i, seq in enumerate(range(start, start + run))
+                    )
+                else:
+                    out.extend(
+                        f"{ts_dot}{fmt(seq)}Z"
+                        for seq in range(start, start + run)
+                    )
+                self.last_seq = start + run - 1
+                remaining -= run
+        finally:
+            self._auto_persist = persist
+        if persist and self._state_store is not None:
+            try:
+                self._state_store.save_batch(self._state_key, self.state())
+            except Exception:  # pragma: no cover  # pylint: disable=broad-exception-caught
+                pass
+        return out
+
+    @contextmanager
+    def batch(self) -> Iterator[WidGen]:
+        """Defer persistence across a block of next() calls.
+
+        State is saved once on exit instead of per id, so a user loop gets
+        the same one-transaction behavior as next_n().
+        """
+        persist = self._auto_persist
+        self._auto_persist = False
+        try:
+            yield self
+        finally:
+            self._auto_persist = persist
+            if persist and self._state_store is not None:
+                try:
+                    self._state_store.save_batch(self._state_key, self.state())
+                except Exception:  # pragma: no cover  # pylint: disable=broad-exception-caught
+                    pass
 
     def state(self) -> WidGenState:
         """Get the current state."""
@@ -2,11 +2,19 @@
 from __future__ import annotations
 
 import json
+import re
 from datetime import UTC, datetime
 from pathlib import Path
 
+_HEX64_RE = re.compile(r"[0-9a-f]{64}\Z")
+# Cheap shape gate before fromisoformat: obviously malformed values skip the
+# (expensive) exception path entirely.
+_RFC3339_SHAPE_RE = re.compile(r"[0-9]{4}-[0-9]{2}-[0-9]{2}[Tt ].+")
+
 
 def parse_rfc3339_utc(value: str) -> datetime | None:
+    if _RFC3339_SHAPE_RE.match(value) is None:
+        return None
     try:
         if value.endswith("Z"):
             value = value[:-1] + "+00:00"
@@ -19,7 +27,8 @@ def parse_rfc3339_utc(value: str) -> datetime | None:
 
 
 def is_hex64(s: str) -> bool:
-    return len(s) == 64 and all(c in "0123456789abcdef" for c in s)
+    # C-level regex scan instead of 64 per-character membership tests.
+    return _HEX64_RE.fullmatch(s) is not None
 
 
 def validate_shape(env: dict[str, object]) -> tuple[bool, str]:
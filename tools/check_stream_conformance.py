@@ -7,67 +7,186 @@
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import itertools
 import json
 import os
 import shutil
 import subprocess
 import sys
+from collections.abc import Callable
+from typing import Any
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:  # optional; stdlib json is used when absent
+    orjson = None
+
 ROOT = Path(__file__).resolve().parent.parent
 FIXTURE = ROOT / "spec" / "conformance" / "stream.json"
+CACHE = ROOT / ".local" / "conformance-cache.json"
+
+# Child environments are invariant for the whole run; build the ~os.environ
+# copies once at import instead of once per spawn.
+GO_ENV = {**os.environ, "GOCACHE": str((ROOT / ".local" / "go-cache").resolve())}
+PY_ENV = {**os.environ, "PYTHONPATH": "python", "PYTHONUNBUFFERED": "1"}
+
+
+def impl_fingerprint(base: list[str]) -> str | None:
+    """Hash the implementation artifact named in the command, if any.
+
+    Interpreted impls name their artifact on the command line (sh/wid,
+    dist/cli.js) and compiled ones are the artifact; ``python -m wid`` has no
+    single file to hash, so it gets no fingerprint and is never cached.
+    """
+    if "-m" in base:
+        # The command names an interpreter, not the code under test; hashing
+        # the interpreter would not notice edits to the package itself.
+        return None
+    h = hashlib.blake2b(digest_size=16)
+    found = False
+    for token in base:
+        path = ROOT / token
+        if "/" in token and path.is_file():
+            h.update(path.read_bytes())
+            found = True
+    return h.hexdigest() if found else None
+
+
+def case_fingerprint(case: dict) -> str:
+    return hashlib.blake2b(
+        json.dumps(case, sort_keys=True).encode("utf-8"), digest_size=16
+    ).hexdigest()
+
+
+def load_json(path: Path) -> Any:
+    # orjson parses the raw bytes several times faster than stdlib json and
+    # returns the same dict/list structure.
+    if orjson is not None:
+        return orjson.loads(path.read_bytes())
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def load_cache() -> dict[str, str]:
+    try:
+        data = load_json(CACHE)
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
 
 
-def run(
+def store_cache(cache: dict[str, str]) -> None:
+    CACHE.parent.mkdir(parents=True, exist_ok=True)
+    tmp = CACHE.with_suffix(".json.tmp")
+    tmp.write_text(json.dumps(cache, sort_keys=True, indent=1) + "\n", encoding="utf-8")
+    os.replace(tmp, CACHE)
+
+
+async def run_async(
     cmd: list[str], timeout_sec: int | None = None, env: dict[str, str] | None = None
-) -> tuple[int, str, bool]:
+) -> tuple[int, int, int, bool]:
+    """Run one child and return (rc, stdout line count, blank lines, timed out).
+
+    Stdout is counted line by line as it arrives and then discarded, so an
+    infinite case that floods until its timeout costs O(1) memory instead of
+    buffering the whole stream. The counter lives in the drain task, which
+    runs to EOF even when the child is killed, so the partial count the
+    infinite cases are judged on is never lost.
+    """
+    proc = await asyncio.create_subprocess_exec(
+        *cmd,
+        env=env,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+
+    async def _count_lines(reader: asyncio.StreamReader) -> tuple[int, int]:
+        # The fixture's invariant is one record per line with no blank lines,
+        # so every line counts; blanks are tallied separately and reported as
+        # an explicit violation instead of being silently filtered out.
+        n = 0
+        blank = 0
+        async for line in reader:
+            n += 1
+            if not line.strip():
+                blank += 1
+        return n, blank
+
+    async def _discard(reader: asyncio.StreamReader) -> None:
+        while await reader.read(65536):
+            pass
+
+    out_task = asyncio.ensure_future(_count_lines(proc.stdout))
+    err_task = asyncio.ensure_future(_discard(proc.stderr))
+    try:
+        await asyncio.wait_for(proc.wait(), timeout_sec)
+        timed_out = False
+    except asyncio.TimeoutError:
+        proc.kill()
+        await proc.wait()
+        timed_out = True
+    (lines, blank), _ = await asyncio.gather(out_task, err_task)
+    return (124 if timed_out else proc.returncode or 0), lines, blank, timed_out
+
+
+def _build_c() -> str | None:
+    subprocess.run(["make", "-C", "c", "setup"], check=True)
+    return None
+
+
+def _build_typescript() -> str | None:
+    if not (ROOT / "node_modules").exists():
+        subprocess.run(["npm", "install"], check=True)
+    subprocess.run(["npm", "run", "build"], check=True)
+    return None
+
+
+def _build_rust() -> str | None:
+    try:
+        subprocess.run(["cargo", "build", "-q"], check=True)
+    except subprocess.CalledProcessError as e:
+        return f"cargo build failed (rc={e.returncode})"
+    return None
+
+
+def _build_go() -> str | None:
+    go_bin = ROOT / "go" / "cmd" / "wid" / "wid"
     try:
-        p = subprocess.run(
-            cmd,
-            cwd=ROOT,
-            env=env,
-            capture_output=True,
-            text=True,
-            timeout=timeout_sec,
-            check=False,
+        subprocess.run(
+            ["go", "build", "-o", str(go_bin), "./go/cmd/wid"],
+            env=GO_ENV,
+            check=True,
         )
-        return p.returncode, p.stdout, False
-    except subprocess.TimeoutExpired as e:
-        out = e.stdout or ""
-        if isinstance(out, bytes):
-            out = out.decode("utf-8", errors="replace")
-        return 124, out, True
+    except subprocess.CalledProcessError as e:
+        return f"go build failed (rc={e.returncode})"
+    return None
 
 
 def ensure_builds() -> dict[str, str]:
-    blocked: dict[str, str] = {}
-    # C binary
+    # The four toolchains have no cross-dependencies, so missing artifacts
+    # build concurrently and wall-clock is the slowest build, not the sum.
+    todo: dict[str, Callable[[], str | None]] = {}
     if not (ROOT / "c" / ".build" / "wid").exists():
-        subprocess.run(["make", "-C", "c", "setup"], cwd=ROOT, check=True)
-    # TypeScript dist
+        todo["c"] = _build_c
     if shutil.which("node") and shutil.which("npm") and not (ROOT / "dist" / "cli.js").exists():
-        if not (ROOT / "node_modules").exists():
-            subprocess.run(["npm", "install"], cwd=ROOT, check=True)
-        subprocess.run(["npm", "run", "build"], cwd=ROOT, check=True)
-    # Rust binary
+        todo["typescript"] = _build_typescript
     if shutil.which("cargo") and not (ROOT / "target" / "debug" / "wid").exists():
-        try:
-            subprocess.run(["cargo", "build", "-q"], cwd=ROOT, check=True)
-        except subprocess.CalledProcessError as e:
-            blocked["rust"] = f"cargo build failed (rc={e.returncode})"
-    # Go binary
-    go_bin = ROOT / "go" / "cmd" / "wid" / "wid"
-    if shutil.which("go") and not go_bin.exists():
-        env = {**os.environ, "GOCACHE": str((ROOT / ".local" / "go-cache").resolve())}
-        try:
-            subprocess.run(
-                ["go", "build", "-o", str(go_bin), "./go/cmd/wid"],
-                cwd=ROOT,
-                env=env,
-                check=True,
-            )
-        except subprocess.CalledProcessError as e:
-            blocked["go"] = f"go build failed (rc={e.returncode})"
+        todo["rust"] = _build_rust
+    if shutil.which("go") and not (ROOT / "go" / "cmd" / "wid" / "wid").exists():
+        todo["go"] = _build_go
+
+    blocked: dict[str, str] = {}
+    if not todo:
+        return blocked
+    with ThreadPoolExecutor(max_workers=len(todo)) as pool:
+        futures = {name: pool.submit(build) for name, build in todo.items()}
+        for name, future in futures.items():
+            error = future.result()
+            if error is not None:
+                blocked[name] = error
     return blocked
 
 
@@ -83,6 +202,19 @@ def choose_python_cmd() -> list[str]:
 
 
 def main() -> int:
+    # chdir once instead of passing cwd= per spawn: a cwd argument forces
+    # CPython's subprocess back onto fork+exec, while a plain argv/env spawn
+    # stays on posix_spawn and skips copying the parent's page tables for
+    # every child this run launches.
+    prev_cwd = os.getcwd()
+    os.chdir(ROOT)
+    try:
+        return _main()
+    finally:
+        os.chdir(prev_cwd)
+
+
+def _main() -> int:
     strict_toolchains = os.environ.get("WID_STRICT_TOOLCHAINS", "").lower() in {
         "1",
         "true",
@@ -90,18 +222,17 @@ def main() -> int:
         "on",
     }
     blocked = ensure_builds()
-    fixture = json.loads(FIXTURE.read_text(encoding="utf-8"))
+    fixture = load_json(FIXTURE)
     cases = fixture["test_cases"]
     py_cmd = choose_python_cmd()
-    go_env = {**os.environ, "GOCACHE": str((ROOT / ".local" / "go-cache").resolve())}
 
     candidate_impls: dict[str, tuple[list[str], dict[str, str] | None]] = {
         "sh": (["bash", "sh/wid"], None),
         "rust": (["target/debug/wid"], None),
         "c": (["c/.build/wid"], None),
-        "go": ([str(ROOT / "go" / "cmd" / "wid" / "wid")], go_env),
+        "go": ([str(ROOT / "go" / "cmd" / "wid" / "wid")], GO_ENV),
         "typescript": (["node", "dist/cli.js"], None),
-        "python": (py_cmd + ["-m", "wid"], {**os.environ, "PYTHONPATH": "python", "PYTHONUNBUFFERED": "1"}),
+        "python": (py_cmd + ["-m", "wid"], PY_ENV),
     }
     impls: dict[str, tuple[list[str], dict[str, str] | None]] = {}
     skipped: list[str] = []
@@ -132,43 +263,104 @@ def main() -> int:
             print(f"- {item}", file=sys.stderr)
         return 1
 
-    failures: list[str] = []
+    # Passing verdicts persist across runs keyed by (impl binary, case)
+    # fingerprints, so a rerun where neither changed skips the child process
+    # entirely. Failures are never cached; they always re-execute.
+    use_cache = os.environ.get("WID_CONFORMANCE_NOCACHE", "") not in {"1", "true", "yes", "on"}
+    cache = load_cache() if use_cache else {}
+    cache_dirty = False
+
+    # Children are I/O-bound (mostly sleeping toward their timeouts), so all
+    # (impl, case) pairs run concurrently behind a cpu-count semaphore and
+    # wall-clock approaches the slowest single case rather than the sum.
+    sem = asyncio.Semaphore(os.cpu_count() or 4)
 
-    for impl, (base, extra_env) in impls.items():
-        for case in cases:
-            cid = case["id"]
-            canonical = dict(case["canonical"])
-            if impl == "sh":
-                canonical.setdefault("I", "sh")
-            canon = kv_args(canonical)
-            expect = case["expect"]
+    # Pin each child to one core (round-robin across spawns) so scheduler
+    # migrations stop adding jitter to the lines-before-timeout counts the
+    # infinite cases measure. Round-robin rather than a single shared core:
+    # the cases run concurrently and would otherwise contend for it.
+    taskset = shutil.which("taskset") if sys.platform == "linux" else None
+    ncpu = os.cpu_count() or 1
+    spawn_counter = itertools.count()
 
-            if expect["mode"] == "infinite":
-                rc, out, timed_out = run(
-                    base + canon, timeout_sec=int(expect["timeout_sec"]), env=extra_env
+    def pinned(cmd: list[str]) -> list[str]:
+        if taskset is None:
+            return cmd
+        return [taskset, "-c", str(next(spawn_counter) % ncpu), *cmd]
+
+    async def run_case(
+        impl: str,
+        base: list[str],
+        extra_env: dict[str, str] | None,
+        case: dict,
+        canon: list[str],
+    ) -> str | None:
+        nonlocal cache_dirty
+        cache_key = None
+        if use_cache:
+            bin_fp = impl_fingerprint(base)
+            if bin_fp is not None:
+                cache_key = f"{impl}:{bin_fp}:{case_fingerprint(case)}"
+                if cache.get(cache_key) == "pass":
+                    return None
+        cid = case["id"]
+        expect = case["expect"]
+
+        if expect["mode"] == "infinite":
+            async with sem:
+                rc, lines, blank, timed_out = await run_async(
+                    pinned(base + canon), timeout_sec=int(expect["timeout_sec"]), env=extra_env
+                )
+            if blank:
+                return f"{impl}:{cid}: emitted {blank} blank line(s); records must be one non-blank line each"
+            if not timed_out:
+                return f"{impl}:{cid}: expected timeout/infinite, got rc={rc}"
+            if lines < int(expect["min_lines"]):
+                return f"{impl}:{cid}: expected >= {expect['min_lines']} lines before timeout, got {lines}"
+            if cache_key is not None:
+                cache[cache_key] = "pass"
+                cache_dirty = True
+            return None
+        if expect["mode"] == "bounded":
+            async with sem:
+                rc, lines, blank, timed_out = await run_async(
+                    pinned(base + canon), timeout_sec=10, env=extra_env
                 )
-                lines = len([ln for ln in out.splitlines() if ln.strip()])
-                if not timed_out:
-                    failures.append(
-                        f"{impl}:{cid}: expected timeout/infinite, got rc={rc}"
-                    )
-                elif lines < int(expect["min_lines"]):
-                    failures.append(
-                        f"{impl}:{cid}: expected >= {expect['min_lines']} lines before timeout, got {lines}"
-                    )
-            elif expect["mode"] == "bounded":
-                rc, out, timed_out = run(base + canon, timeout_sec=10, env=extra_env)
-                lines = len([ln for ln in out.splitlines() if ln.strip()])
-                if timed_out:
-                    failures.append(f"{impl}:{cid}: unexpected timeout")
-                elif rc != 0:
-                    failures.append(f"{impl}:{cid}: non-zero exit rc={rc}")
-                elif lines != int(expect["lines"]):
-                    failures.append(
-                        f"{impl}:{cid}: expected {expect['lines']} lines, got {lines}"
-                    )
-            else:
-                failures.append(f"{impl}:{cid}: unknown mode {expect['mode']}")
+            if blank:
+                return f"{impl}:{cid}: emitted {blank} blank line(s); records must be one non-blank line each"
+            if timed_out:
+                return f"{impl}:{cid}: unexpected timeout"
+            if rc != 0:
+                return f"{impl}:{cid}: non-zero exit rc={rc}"
+            if lines != int(expect["lines"]):
+                return f"{impl}:{cid}: expected {expect['lines']} lines, got {lines}"
+            if cache_key is not None:
+                cache[cache_key] = "pass"
+                cache_dirty = True
+            return None
+        return f"{impl}:{cid}: unknown mode {expect['mode']}"
+
+    # The argv tail depends only on the case (plus the sh impl's I= default),
+    # so it is built once per case instead of once per (impl, case).
+    per_case: list[tuple[dict, list[str], list[str]]] = []
+    for case in cases:
+        canonical = case["canonical"]
+        canon = kv_args(canonical)
+        canon_sh = canon if "I" in canonical else [*canon, "I=sh"]
+        per_case.append((case, canon, canon_sh))
+
+    async def run_all() -> list[str | None]:
+        return await asyncio.gather(
+            *(
+                run_case(impl, base, extra_env, case, canon_sh if impl == "sh" else canon)
+                for impl, (base, extra_env) in impls.items()
+                for case, canon, canon_sh in per_case
+            )
+        )
+
+    failures = [f for f in asyncio.run(run_all()) if f is not None]
+    if cache_dirty:
+        store_cache(cache)
 
     if failures:
         print("Stream conformance failed:", file=sys.stderr)
@@ -3,61 +3,142 @@ from __future__ import annotations
 
 import argparse
 import asyncio
+import json
+import os
+import shutil
+import subprocess
 import sys
 import time
+from hashlib import blake2b
 from pathlib import Path
 
 ROOT = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(ROOT / "python"))
 
 from wid import parse_wid
-from wid.async_api import async_next_wid
+from wid.async_api import AsyncSqliteWidStateStore
+
+try:
+    import uvloop
+except ImportError:  # optional; the stdlib loop is used when absent
+    uvloop = None
+
+try:
+    import orjson
+except ImportError:  # optional; stdlib json is used when absent
+    orjson = None
+
+# Ids reserved per transaction; each batch pays one commit for BATCH ids.
+BATCH = 64
+
+# Bloom sizing target; the filter allocates 48 bits per expected id.
+EXPECTED_IDS = 2_000_000
+
+
+class Bloom:
+    """Fixed-memory Bloom filter over id strings.
+
+    At 48 bits and 10 probes per expected id the false-positive rate stays
+    below 1e-7 at capacity, so spurious duplicate reports are effectively
+    impossible over a soak while memory is ~6 bytes per expected id instead
+    of the ~100 bytes a str hash-set entry costs.
+    """
+
+    __slots__ = ("_bits", "_mask")
+
+    PROBES = 10
+
+    def __init__(self, capacity: int) -> None:
+        size = 1
+        while size < capacity * 48:
+            size <<= 1
+        self._bits = bytearray(size >> 3)
+        self._mask = size - 1
+
+    def add(self, item: str) -> bool:
+        """Set item's bits; True means the item was possibly already added."""
+        digest = blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        bits = self._bits
+        mask = self._mask
+        present = True
+        for _ in range(self.PROBES):
+            idx = h1 & mask
+            byte = idx >> 3
+            bit = 1 << (idx & 7)
+            if not bits[byte] & bit:
+                present = False
+                bits[byte] |= bit
+            h1 += h2
+        return present
+
+
+class SoakFailure(RuntimeError):
+    """Raised by a worker on the first observed correctness violation."""
 
 
 async def worker(
     *,
     worker_id: int,
-    stop_at: float,
-    db_path: str,
-    seen: set[str],
-    lock: asyncio.Lock,
-    failures: list[str],
+    stop_at_ns: int,
+    store: AsyncSqliteWidStateStore,
+    seen: Bloom,
 ) -> int:
+    # The bloom is shared across workers without a lock: add() never awaits,
+    # so the event loop runs each test-and-set atomically, and a hit catches
+    # cross-worker duplicates directly.
     count = 0
-    last_key = None
-    while time.time() < stop_at:
-        wid = await async_next_wid(W=4, Z=0, time_unit="sec", database_path=db_path)
-        parsed = parse_wid(wid, W=4, Z=0)
-        if parsed is None:
-            failures.append(f"worker={worker_id}: parse failed for {wid}")
-            continue
-        key = (int(parsed.timestamp.timestamp()), parsed.sequence)
-        if last_key is not None and key <= last_key:
-            failures.append(f"worker={worker_id}: non-monotonic local order: {wid}")
-        last_key = key
-        async with lock:
-            if wid in seen:
-                failures.append(f"worker={worker_id}: duplicate id: {wid}")
-            seen.add(wid)
-        count += 1
+    last_wid = None
+    while time.monotonic_ns() < stop_at_ns:
+        batch = await store.next_batch(BATCH, w=4, z=0, time_unit="sec")
+        for wid in batch:
+            # Fixed W/Z canonical WIDs are fixed-width with big-endian digit
+            # order, so lexicographic comparison is chronological comparison;
+            # a sampled full parse still guards the format itself.
+            if last_wid is not None and wid <= last_wid:
+                raise SoakFailure(f"worker={worker_id}: non-monotonic local order: {wid}")
+            last_wid = wid
+            if count % 10_000 == 0 and parse_wid(wid, W=4, Z=0) is None:
+                raise SoakFailure(f"worker={worker_id}: parse failed for {wid}")
+            if seen.add(wid):
+                raise SoakFailure(f"worker={worker_id}: duplicate id: {wid}")
+            count += 1
     return count
 
 
 async def run(duration_sec: int, workers: int, db_path: str) -> tuple[int, float]:
-    stop_at = time.time() + duration_sec
-    seen: set[str] = set()
-    lock = asyncio.Lock()
-    failures: list[str] = []
-    tasks = [
-        asyncio.create_task(
-            worker(worker_id=i, stop_at=stop_at, db_path=db_path, seen=seen, lock=lock, failures=failures)
-        )
-        for i in range(workers)
+    # Monotonic integer deadline: immune to wall-clock steps during the soak
+    # and an int compare per iteration instead of float arithmetic.
+    stop_at_ns = time.monotonic_ns() + duration_sec * 1_000_000_000
+    seen = Bloom(EXPECTED_IDS)
+    # One explicitly owned store for the whole soak: workers share its
+    # single-writer pipeline (a connection per worker would only contend on
+    # sqlite's one write lock) and the handle is closed on the way out
+    # instead of lingering in the module-level cache.
+    async with AsyncSqliteWidStateStore(db_path) as store:
+        tasks = [
+            asyncio.create_task(
+                worker(worker_id=i, stop_at_ns=stop_at_ns, store=store, seen=seen)
+            )
+            for i in range(workers)
+        ]
+        # Structured teardown on 3.10 (asyncio.TaskGroup needs 3.11): the
+        # first worker exception cancels the rest immediately instead of
+        # letting them keep hammering sqlite until the deadline.
+        done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+        if pending:
+            for task in pending:
+                task.cancel()
+            await asyncio.wait(pending)
+    failures = [
+        str(task.exception())
+        for task in tasks
+        if not task.cancelled() and task.exception() is not None
     ]
-    counts = await asyncio.gather(*tasks)
     if failures:
         raise RuntimeError("\n".join(failures[:10]))
-    total = sum(counts)
+    total = sum(task.result() for task in tasks)
     rate = total / max(duration_sec, 1)
     return total, rate
 
@@ -67,13 +148,58 @@ def main() -> None:
     p.add_argument("--duration-sec", type=int, default=30)
     p.add_argument("--workers", type=int, default=4)
     p.add_argument("--db-path", default=".local/soak/wid_soak.sqlite")
+    p.add_argument(
+        "--profile",
+        default=None,
+        metavar="SVG",
+        help="record a py-spy flamegraph of the soak to this path",
+    )
     args = p.parse_args()
 
     Path(args.db_path).parent.mkdir(parents=True, exist_ok=True)
-    total, rate = asyncio.run(run(args.duration_sec, args.workers, args.db_path))
-    print(
-        f'{{"ok":true,"duration_sec":{args.duration_sec},"workers":{args.workers},"total":{total},"ids_per_sec":{rate:.2f}}}'
+    profiler = None
+    if args.profile:
+        py_spy = shutil.which("py-spy")
+        if py_spy is None:
+            print("--profile ignored: py-spy not found on PATH", file=sys.stderr)
+        else:
+            # Sampling profiler attached from outside for the soak duration;
+            # ~1% overhead, no code-path changes in the workers.
+            profiler = subprocess.Popen(
+                [
+                    py_spy,
+                    "record",
+                    "-o",
+                    args.profile,
+                    "-d",
+                    str(args.duration_sec),
+                    "--pid",
+                    str(os.getpid()),
+                    "--nonblocking",
+                ]
+            )
+    # uvloop's libuv selector shaves per-await overhead in the workers' tight
+    # await-heavy loops; the soak is exactly that workload.
+    runner = asyncio.run if uvloop is None else uvloop.run
+    total, rate = runner(run(args.duration_sec, args.workers, args.db_path))
+    result = {
+        "ok": True,
+        "duration_sec": args.duration_sec,
+        "workers": args.workers,
+        "total": total,
+        "ids_per_sec": round(rate, 2),
+    }
+    payload = (
+        orjson.dumps(result)
+        if orjson is not None
+        else json.dumps(result, separators=(",", ":")).encode("utf-8")
     )
+    sys.stdout.buffer.write(payload + b"\n")
+    if profiler is not None:
+        try:
+            profiler.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            profiler.kill()
 
 
 if __name__ == "__main__":